@@ -1,27 +1,65 @@
-from typing import Dict, Type
+import importlib
+import importlib.util
+from typing import Any, Dict, List, Type, Union
 from browser.interface import BrowserAutomation
-from browser.playwright import PlaywrightAutomation
-from browser.playwright_single_page import PlaywrightSinglePageAutomation
 
 class BrowserFactory:
     """Factory for creating browser automation instances."""
-    
-    _implementations: Dict[str, Type[BrowserAutomation]] = {
-        "playwright": PlaywrightAutomation,
-        "playwright_single_page": PlaywrightSinglePageAutomation,
+
+    # Built-in implementations are registered as "module:ClassName" strings so that
+    # heavy automation libraries are only imported once they are actually requested.
+    # Implementation classes register themselves when their module is imported (see
+    # BrowserAutomation.__init_subclass__), replacing the lazy reference.
+    _implementations: Dict[str, Union[str, Type[BrowserAutomation]]] = {
+        "playwright": "browser.playwright:PlaywrightAutomation",
+        "playwright_single_page": "browser.playwright_single_page:PlaywrightSinglePageAutomation",
     }
-    
+
     @classmethod
-    def create(cls, implementation: str = "playwright") -> BrowserAutomation:
-        """Create a browser automation instance."""
+    def create(cls, implementation: str = "playwright", **options: Any) -> BrowserAutomation:
+        """Create a browser automation instance, passing any options to its constructor."""
         if implementation not in cls._implementations:
             supported = ", ".join(cls._implementations.keys())
             raise ValueError(f"Unsupported browser implementation: {implementation}. "
                              f"Supported implementations: {supported}")
+
+        return cls._resolve(implementation)(**options)
+
+    @classmethod
+    def register(cls, name: str, implementation: Union[str, Type[BrowserAutomation]]) -> None:
+        """
+        Register a new browser automation implementation.
+
+        The implementation can be given either as a class or as a lazy
+        "module:ClassName" reference that is imported on first use.
+        """
+        cls._implementations[name] = implementation
+
+    @classmethod
+    def available_implementations(cls) -> List[str]:
+        """
+        List the registered implementations whose modules can be imported.
         
-        return cls._implementations[implementation]()
-    
+        Lazy entries are checked with a module lookup only, without importing them.
+        """
+        available = []
+        for name, entry in cls._implementations.items():
+            if isinstance(entry, str):
+                module_name = entry.split(":", 1)[0]
+                try:
+                    if importlib.util.find_spec(module_name) is None:
+                        continue
+                except ModuleNotFoundError:
+                    continue
+            available.append(name)
+        return available
+
     @classmethod
-    def register(cls, name: str, implementation: Type[BrowserAutomation]) -> None:
-        """Register a new browser automation implementation."""
-        cls._implementations[name] = implementation
\ No newline at end of file
+    def _resolve(cls, implementation: str) -> Type[BrowserAutomation]:
+        """Import a lazily registered implementation and cache the resolved class."""
+        entry = cls._implementations[implementation]
+        if isinstance(entry, str):
+            module_name, class_name = entry.split(":", 1)
+            entry = getattr(importlib.import_module(module_name), class_name)
+            cls._implementations[implementation] = entry
+        return entry
@@ -1,10 +1,23 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Tuple
-from browser.selector import Selector
+from typing import Any, List, Optional, Tuple
+from browser.selector import Selector, SelectorChain
+
+# A condition over element existence, as nested lists: ["exists", [Selector, ...]],
+# ["and", left, right], ["or", left, right] or ["not", operand]
+ExistsTree = List[Any]
+
+# A value to read below each of a list of elements: candidate selector chains tried
+# in order, the attribute to read (None for text content), and whether to read all
+# matches of the first matching chain or only the first match
+ExtractField = Tuple[List[SelectorChain], Optional[str], bool]
 
 class Element(ABC):
     """Interface for a DOM element that can be queried."""
     
+    # Element wrappers are created for every query result, keep them lean
+    __slots__ = ()
+    
     @abstractmethod
     async def query(self, selector: str) -> Optional['Element']:
         """Find the first child element matching the selector."""
@@ -16,7 +29,18 @@ class Element(ABC):
         pass
 
 class BrowserAutomation(ABC):
-    """Interface for browser automation libraries."""
+    """
+    Interface for browser automation libraries.
+    
+    Implementations register themselves with the BrowserFactory by passing a name
+    in the class definition: `class MyAutomation(BrowserAutomation, name="mine")`.
+    """
+    
+    def __init_subclass__(cls, name: Optional[str] = None, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if name is not None:
+            from browser.factory import BrowserFactory
+            BrowserFactory.register(name, cls)
     
     @abstractmethod
     async def launch(self, headless: bool = True) -> None:
@@ -24,8 +48,20 @@ class BrowserAutomation(ABC):
         pass
     
     @abstractmethod
-    async def goto(self, url: str) -> None:
-        """Navigate to the specified URL."""
+    async def goto(self, url: str, wait_for: Optional[str] = None) -> None:
+        """
+        Navigate to the specified URL.
+        
+        Navigation completes once the DOM is parsed. If `wait_for` is given, also
+        wait until an element matching that CSS selector is attached.
+        """
+        pass
+
+    async def wait_for_settled(self, timeout: float = 10.0) -> None:
+        """
+        Wait until the current page has stopped loading network resources, for at
+        most `timeout` seconds. Implementations without network tracking return at once.
+        """
         pass
 
     @abstractmethod
@@ -43,6 +79,106 @@ class BrowserAutomation(ABC):
         """Find all elements matching the selector."""
         pass
     
+    async def resolve_selector(self, selector: Selector) -> Optional[Element]:
+        """
+        Resolve a (possibly nested) Selector to the first matching element.
+        
+        Selectors are plain CSS, and invalid selectors raise. The default implementation
+        issues one query per level of the selector chain. Implementations can override
+        this to resolve the whole chain in a single call.
+        """
+        root, chain = selector.anchored()
+        elements = await self._resolve_chain(chain, first=True, root=root)
+        return elements[0] if elements else None
+
+    async def resolve_all(self, selector: Selector) -> List[Element]:
+        """Resolve a (possibly nested) Selector to all matching elements."""
+        root, chain = selector.anchored()
+        return await self._resolve_chain(chain, first=False, root=root)
+
+    async def first_matching(self, selectors: List[Selector]) -> Tuple[int, int]:
+        """
+        Find the first selector in the list that matches any elements.
+        
+        Invalid selectors raise instead of counting as not matching. Implementations
+        can override this to probe all selectors in one call.
+        
+        Returns:
+            (index of the first matching selector, its element count), or (-1, 0)
+        """
+        for i, selector in enumerate(selectors):
+            count = len(await self.resolve_all(selector))
+            if count:
+                return i, count
+        return -1, 0
+
+    async def evaluate_exists(self, tree: ExistsTree) -> bool:
+        """
+        Evaluate a condition tree of existence checks, short-circuiting and/or.
+        
+        An "exists" leaf is true if any of its selectors matches an element.
+        Implementations can override this to evaluate the whole tree in one call.
+        """
+        operator = tree[0]
+        if operator == "exists":
+            index, _ = await self.first_matching(tree[1])
+            return index >= 0
+        if operator == "and":
+            return await self.evaluate_exists(tree[1]) and await self.evaluate_exists(tree[2])
+        if operator == "or":
+            return await self.evaluate_exists(tree[1]) or await self.evaluate_exists(tree[2])
+        if operator == "not":
+            return not await self.evaluate_exists(tree[1])
+        raise ValueError(f"Unsupported condition operator: {operator}")
+
+    async def resolve_first_matching(self, selectors: List[Selector]) -> Tuple[int, List[Element]]:
+        """
+        Resolve all elements of the first selector in the list that matches any.
+        
+        A single selector is resolved directly, without a separate probe.
+        
+        Returns:
+            (index of the matching selector, its elements), or (-1, [])
+        """
+        if len(selectors) == 1:
+            elements = await self.resolve_all(selectors[0])
+            return (0, elements) if elements else (-1, [])
+        
+        index, _ = await self.first_matching(selectors)
+        if index < 0:
+            return -1, []
+        return index, await self.resolve_all(selectors[index])
+
+    async def _resolve_chain(self, chain: SelectorChain, first: bool, root: Optional[Element] = None) -> List[Element]:
+        """
+        Walk a flattened selector chain level by level, starting from root if given.
+        
+        Every level but the last narrows the search to a single parent element:
+        the one at the level's index, or the first match if no index is set.
+        """
+        if not chain:
+            return [root] if root else []
+
+        parent: Optional[Element] = root
+        for css_selector, index in chain[:-1]:
+            if index is None:
+                parent = await (parent.query(css_selector) if parent else self.query_selector(css_selector))
+            else:
+                elements = await (parent.query_all(css_selector) if parent else self.query_selector_all(css_selector))
+                parent = elements[index] if 0 <= index < len(elements) else None
+            if parent is None:
+                return []
+
+        css_selector, index = chain[-1]
+        if index is None and first:
+            element = await (parent.query(css_selector) if parent else self.query_selector(css_selector))
+            return [element] if element else []
+
+        elements = await (parent.query_all(css_selector) if parent else self.query_selector_all(css_selector))
+        if index is None:
+            return elements
+        return [elements[index]] if 0 <= index < len(elements) else []
+    
     @abstractmethod
     async def extract_text(self, element: Element) -> str:
         """Extract text content from an element."""
@@ -53,6 +189,93 @@ class BrowserAutomation(ABC):
         """Extract attribute value from an element."""
         pass
     
+    async def extract_texts(self, selector: Selector) -> List[str]:
+        """
+        Extract text content from every element matching the selector.
+        
+        The elements are read concurrently. Implementations can override this to
+        read all elements in one call.
+        """
+        elements = await self.resolve_all(selector)
+        extract_text = self.extract_text
+        return list(await asyncio.gather(*[extract_text(element) for element in elements]))
+    
+    async def extract_attributes(self, selector: Selector, attribute: str) -> List[Optional[str]]:
+        """Extract an attribute value from every element matching the selector, concurrently."""
+        elements = await self.resolve_all(selector)
+        extract_attribute = self.extract_attribute
+        return list(await asyncio.gather(*[extract_attribute(element, attribute) for element in elements]))
+    
+    async def extract_from_elements(self, elements: List[Element],
+                                    fields: List[ExtractField]) -> List[List[List[Any]]]:
+        """
+        Read several fields below each element in a list, e.g. the rows of a foreach loop.
+        
+        Returns one list per element, holding one entry per field. A single-value field
+        gives [value] for the first chain that matches, or [] if none does. A list field
+        gives [index of the first chain with matches, values], or [-1, []].
+        Implementations can override this to read all elements in one call.
+        """
+        resolve_chain, extract_text, extract_attribute = self._resolve_chain, self.extract_text, self.extract_attribute
+        records = []
+        for element in elements:
+            record = []
+            for chains, attribute, many in fields:
+                entry: List[Any] = [-1, []] if many else []
+                for i, chain in enumerate(chains):
+                    matches = await resolve_chain(chain, first=not many, root=element)
+                    if not matches:
+                        continue
+                    if attribute is None:
+                        values = [await extract_text(match) for match in matches]
+                    else:
+                        values = [await extract_attribute(match, attribute) for match in matches]
+                    entry = [i, values] if many else values
+                    break
+                record.append(entry)
+            records.append(record)
+        return records
+    
+    async def extract_first(self, selectors: List[Selector],
+                            attribute: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """
+        Read text content (attribute is None) or an attribute from the first element
+        of the first selector in the list that matches any elements.
+        
+        Implementations can override this to resolve and read in one call.
+        
+        Returns:
+            (index of the matching selector, the value read), or (-1, None). The value
+            is None if the element does not have the attribute.
+        """
+        for i, selector in enumerate(selectors):
+            element = await self.resolve_selector(selector)
+            if element is not None:
+                if attribute is None:
+                    return i, await self.extract_text(element)
+                return i, await self.extract_attribute(element, attribute)
+        return -1, None
+    
+    async def extract_first_matching(self, selectors: List[Selector],
+                                     attribute: Optional[str] = None) -> Tuple[int, List[Optional[str]]]:
+        """
+        Read text content (attribute is None) or an attribute from all elements of
+        the first selector in the list that matches any elements.
+        
+        Implementations can override this to try all selectors in one call.
+        
+        Returns:
+            (index of the matching selector, the values read), or (-1, [])
+        """
+        for i, selector in enumerate(selectors):
+            if attribute is None:
+                values = await self.extract_texts(selector)
+            else:
+                values = await self.extract_attributes(selector, attribute)
+            if values:
+                return i, values
+        return -1, []
+    
     @abstractmethod
     async def click(self, element: Element) -> bool:
         """Click on an element. Returns True if successful."""
@@ -68,6 +291,15 @@ class BrowserAutomation(ABC):
         """Navigate forward in browser history."""
         pass
     
+    async def reset(self) -> None:
+        """
+        Return the browser to a blank page so it can run another script.
+        
+        Used by the browser pool between jobs. Implementations can override this
+        to also drop history and cookies.
+        """
+        await self.goto("about:blank")
+    
     @abstractmethod
     async def cleanup(self) -> None:
         """Clean up resources."""
@@ -1,9 +1,494 @@
-from typing import List, Optional, Any
-from playwright.async_api import async_playwright, ElementHandle, Page, Browser
-from browser.interface import BrowserAutomation, Element
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urldefrag
+from typing import Dict, FrozenSet, Iterable, List, Optional, Any, Tuple, Union
+from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError, ElementHandle, Page, Browser, Playwright, Request, Route
+from browser.interface import BrowserAutomation, Element, ExistsTree, ExtractField
+from browser.selector import Selector, SelectorChain
+
+# Resolves a flattened selector chain inside the page, so a nested selector costs
+# a single round-trip instead of one query per level. The chain starts from root
+# (an element handle) when given, else from the document. Mirrors the semantics
+# of BrowserAutomation._resolve_chain.
+#
+# Every selector of this backend is resolved here, with the browser's native CSS
+# engine, so all statements agree on which elements a selector matches. Unlike
+# Playwright's own engine, this does not look into shadow roots and does not accept
+# Playwright selector syntax (text=, :has-text(), >>). Invalid CSS raises.
+_RESOLVE_CHAIN_JS = """
+([root, chain, first]) => {
+    if (!chain.length) return first ? root : (root ? [root] : []);
+    let parent = root || document;
+    for (let i = 0; i < chain.length - 1; i++) {
+        const [css, index] = chain[i];
+        parent = index === null ? parent.querySelector(css) : parent.querySelectorAll(css)[index];
+        if (!parent) return first ? null : [];
+    }
+    const [css, index] = chain[chain.length - 1];
+    if (index !== null) {
+        const element = parent.querySelectorAll(css)[index] || null;
+        return first ? element : (element ? [element] : []);
+    }
+    return first ? parent.querySelector(css) : Array.from(parent.querySelectorAll(css));
+}
+"""
+
+# Finds the first [root, chain] pair with any matches and returns [index, count],
+# or [-1, 0]
+_FIRST_MATCHING_JS = f"""
+anchoredChains => {{
+    const resolve = {_RESOLVE_CHAIN_JS.strip()};
+    for (let i = 0; i < anchoredChains.length; i++) {{
+        const [root, chain] = anchoredChains[i];
+        const count = resolve([root, chain, false]).length;
+        if (count) return [i, count];
+    }}
+    return [-1, 0];
+}}
+"""
+
+# Evaluates a condition tree of existence checks (see ExistsTree) whose selectors
+# have been replaced by [root, chain] pairs
+_EVALUATE_EXISTS_JS = f"""
+tree => {{
+    const resolve = {_RESOLVE_CHAIN_JS.strip()};
+    const matches = ([root, chain]) => resolve([root, chain, true]) != null;
+    const evaluate = node => {{
+        switch (node[0]) {{
+            case 'exists': return node[1].some(matches);
+            case 'and': return evaluate(node[1]) && evaluate(node[2]);
+            case 'or': return evaluate(node[1]) || evaluate(node[2]);
+            case 'not': return !evaluate(node[1]);
+        }}
+        throw new Error('Unsupported condition operator: ' + node[0]);
+    }};
+    return evaluate(tree);
+}}
+"""
+
+# Reads text content (attribute is null) or an attribute from a list of elements.
+_READ_ELEMENTS_JS = """
+(elements, attribute) => elements.map(
+    element => attribute === null ? (element.textContent || '') : element.getAttribute(attribute)
+)
+"""
+
+# Reads from the elements matching a chain below a root element, or the document
+_READ_ANCHORED_JS = f"""
+([root, chain, attribute]) => ({_READ_ELEMENTS_JS.strip()})(({_RESOLVE_CHAIN_JS.strip()})([root, chain, false]), attribute)
+"""
+
+# Reads from the elements of the first [root, chain] pair with any matches and
+# returns [index, values], or [-1, []]
+_READ_FIRST_MATCHING_JS = f"""
+([anchoredChains, attribute]) => {{
+    const resolve = {_RESOLVE_CHAIN_JS.strip()};
+    const read = {_READ_ELEMENTS_JS.strip()};
+    for (let i = 0; i < anchoredChains.length; i++) {{
+        const [root, chain] = anchoredChains[i];
+        const elements = resolve([root, chain, false]);
+        if (elements.length) return [i, read(elements, attribute)];
+    }}
+    return [-1, []];
+}}
+"""
+
+# Reads from the first element of the first [root, chain] pair with any matches and
+# returns [index, value], or [-1, null]
+_READ_FIRST_JS = f"""
+([anchoredChains, attribute]) => {{
+    const resolve = {_RESOLVE_CHAIN_JS.strip()};
+    const read = {_READ_ELEMENTS_JS.strip()};
+    for (let i = 0; i < anchoredChains.length; i++) {{
+        const [root, chain] = anchoredChains[i];
+        const element = resolve([root, chain, true]);
+        if (element) return [i, read([element], attribute)[0]];
+    }}
+    return [-1, null];
+}}
+"""
+
+# Reads [chains, attribute, many] fields below each element of a list, in the
+# format of BrowserAutomation.extract_from_elements
+_EXTRACT_FROM_ELEMENTS_JS = f"""
+([elements, fields]) => {{
+    const resolve = {_RESOLVE_CHAIN_JS.strip()};
+    const read = {_READ_ELEMENTS_JS.strip()};
+    return elements.map(root => fields.map(([chains, attribute, many]) => {{
+        for (let i = 0; i < chains.length; i++) {{
+            if (many) {{
+                const matches = resolve([root, chains[i], false]);
+                if (matches.length) return [i, read(matches, attribute)];
+            }} else {{
+                const match = resolve([root, chains[i], true]);
+                if (match) return read([match], attribute);
+            }}
+        }}
+        return many ? [-1, []] : [];
+    }}));
+}}
+"""
+
+# Direct DOM read for a single element handle: text content when name is null,
+# otherwise an attribute. Both reads share one function source, so the renderer
+# compiles it once and reuses it for every element.
+_READ_ELEMENT_JS = "(element, name) => name === null ? (element.textContent || '') : element.getAttribute(name)"
+
+def _anchored(selector: Selector) -> Tuple[Optional[ElementHandle], SelectorChain]:
+    """Split a selector into the element handle it is anchored to (if any) and the chain below it."""
+    root, chain = selector.anchored()
+    return (root._handle if root is not None else None), chain
+
+async def _resolve_chain(page: Page, chain: SelectorChain, first: bool,
+                         root: Optional[ElementHandle] = None) -> List[ElementHandle]:
+    """Resolve a flattened selector chain to element handles with one evaluate call."""
+    if not chain:
+        return [root] if root else []
+
+    result = await page.evaluate_handle(_RESOLVE_CHAIN_JS, [root, chain, first])
+    if first:
+        element = result.as_element()
+        if element is None:
+            await result.dispose()
+            return []
+        return [element]
+
+    try:
+        properties = await result.get_properties()
+    finally:
+        await result.dispose()
+    handles = [handle.as_element() for name, handle in properties.items() if name.isdigit()]
+    return [handle for handle in handles if handle is not None]
+
+# Flat selectors resolved on the current page, keyed by (css, first)
+QueryCache = Dict[Tuple[str, bool], List[ElementHandle]]
+_QUERY_CACHE_SIZE = 64
+
+async def _resolve_cached(cache: QueryCache, page: Page, selector: Selector, first: bool) -> List[ElementHandle]:
+    """
+    Resolve a selector, reusing earlier results for flat selectors on the same page.
+    
+    Owners must empty the cache whenever the page changes, with _dispose_cached if the
+    page stays open. Misses are not cached, so elements rendered later are still found.
+    Selectors anchored to an element are never cached. A full cache stops taking new
+    entries instead of evicting old ones, whose elements may still be in use.
+    """
+    root, chain = _anchored(selector)
+    if root is not None or len(chain) != 1 or chain[0][1] is not None:
+        return await _resolve_chain(page, chain, first, root)
+    
+    css_selector = chain[0][0]
+    handles = cache.get((css_selector, first))
+    if handles is None and first:
+        handles = cache.get((css_selector, False), [])[:1] or None
+    if handles is None:
+        handles = await _resolve_chain(page, chain, first)
+        if handles and len(cache) < _QUERY_CACHE_SIZE:
+            cache[(css_selector, first)] = handles
+    return handles
+
+async def _dispose_cached(cache: QueryCache) -> None:
+    """
+    Empty a query cache and dispose its element handles, for pages that stay open
+    (e.g. after a click). The handles of a page that navigates or closes are released
+    with its document, so clearing the cache is enough there.
+    """
+    handles = list({id(handle): handle for matches in cache.values() for handle in matches}.values())
+    cache.clear()
+    if handles:
+        # A handle whose page has gone away since is released already
+        await asyncio.gather(*(handle.dispose() for handle in handles), return_exceptions=True)
+
+async def _first_matching(page: Page, selectors: List[Selector]) -> Tuple[int, int]:
+    """Probe selectors in order inside the page with a single evaluate call."""
+    index, count = await page.evaluate(_FIRST_MATCHING_JS, [list(_anchored(selector)) for selector in selectors])
+    return index, count
+
+def _anchored_tree(tree: ExistsTree) -> List[Any]:
+    """Replace the selectors of a condition tree by [root, chain] pairs the page can evaluate."""
+    if tree[0] == "exists":
+        return ["exists", [list(_anchored(selector)) for selector in tree[1]]]
+    return [tree[0]] + [_anchored_tree(operand) for operand in tree[1:]]
+
+async def _evaluate_exists(page: Page, tree: ExistsTree) -> bool:
+    """Evaluate a whole condition tree inside the page with a single evaluate call."""
+    return await page.evaluate(_EVALUATE_EXISTS_JS, _anchored_tree(tree))
+
+async def _read_chain(page: Page, selector: Selector, attribute: Optional[str]) -> List[Optional[str]]:
+    """
+    Read text content or an attribute from all elements matching a selector.
+    Runs entirely inside the page, so N elements cost one round-trip instead of N.
+    """
+    root, chain = _anchored(selector)
+    if root is None and not chain:
+        return []
+    return await page.evaluate(_READ_ANCHORED_JS, [root, chain, attribute])
+
+async def _read_first_matching(page: Page, selectors: List[Selector],
+                               attribute: Optional[str]) -> Tuple[int, List[Optional[str]]]:
+    """Read from the first selector with matches, trying all selectors in one evaluate call."""
+    if len(selectors) == 1:
+        values = await _read_chain(page, selectors[0], attribute)
+        return (0, values) if values else (-1, [])
+    
+    index, values = await page.evaluate(
+        _READ_FIRST_MATCHING_JS, [[list(_anchored(selector)) for selector in selectors], attribute]
+    )
+    return index, values
+
+async def _read_first(page: Page, selectors: List[Selector],
+                      attribute: Optional[str]) -> Tuple[int, Optional[str]]:
+    """Resolve the first selector with a match and read from its element in one evaluate call."""
+    index, value = await page.evaluate(
+        _READ_FIRST_JS, [[list(_anchored(selector)) for selector in selectors], attribute]
+    )
+    return index, value
+
+async def _extract_from_elements(page: Page, elements: List[Element],
+                                 fields: List[ExtractField]) -> List[List[List[Any]]]:
+    """Read fields below every element with a single evaluate call."""
+    handles = [element._handle for element in elements]
+    return await page.evaluate(_EXTRACT_FROM_ELEMENTS_JS, [handles, [list(field) for field in fields]])
+
+async def _wait_for_settled(page: Page, timeout: float) -> None:
+    """
+    Wait for the page's network to go idle (no connections for 500ms), giving up
+    silently after `timeout` seconds so long-polling pages don't stall the script.
+    """
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout * 1000)
+    except PlaywrightTimeoutError:
+        pass
+
+async def _navigate(page: Page, url: str, timeout: float) -> None:
+    """
+    Navigate a page to a URL and wait for its DOM, each for at most `timeout` ms.
+    
+    Failing to reach the server raises. A page whose response arrived but whose DOM
+    did not finish loading in time (e.g. a stalled script) is kept as it is, so one
+    slow page doesn't stop the whole scrape.
+    """
+    await page.goto(url, wait_until="commit", timeout=timeout)
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+    except PlaywrightTimeoutError:
+        print(f"Warning: {url} did not finish loading within {timeout / 1000:g}s, continuing with the partial page")
+
+# Resolves once the page has run the tasks queued by a click's handlers, e.g. a
+# zero-delay timer that sets location.href
+_AFTER_CLICK_JS = "() => new Promise(resolve => setTimeout(resolve, 0))"
+
+async def _click_navigates(page: Page, element: Element) -> bool:
+    """
+    Click an element and report whether the click navigated the page's main frame.
+    
+    A navigation shows up as a navigation request (or, for same-document navigations,
+    a committed URL change) of the main frame. Once the click has returned, one round
+    trip into the page lets the click's handlers finish, so clicks that stay on the
+    page return right away instead of watching for a navigation for a fixed time. A
+    page whose document is replaced during that round trip has navigated.
+    """
+    navigated = asyncio.Event()
+    
+    def on_request(request: Request) -> None:
+        if request.is_navigation_request() and request.frame == page.main_frame:
+            navigated.set()
+    
+    def on_navigation(frame) -> None:
+        if frame == page.main_frame:
+            navigated.set()
+    
+    page.on("request", on_request)
+    page.on("framenavigated", on_navigation)
+    try:
+        await element.click()
+        if not navigated.is_set():
+            try:
+                await page.evaluate(_AFTER_CLICK_JS)
+            except PlaywrightError:
+                return True
+        return navigated.is_set()
+    finally:
+        page.remove_listener("request", on_request)
+        page.remove_listener("framenavigated", on_navigation)
+
+# Resource types that never affect the DOM a script reads from, blocked by default
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet", "texttrack"})
+
+def _blocked_resource_types(block_resources: Union[bool, Iterable[str]]) -> FrozenSet[str]:
+    """Turn a block_resources option (a flag or Playwright resource types) into the types to block."""
+    if block_resources is True:
+        return _BLOCKED_RESOURCE_TYPES
+    if not block_resources:
+        return frozenset()
+    return frozenset(block_resources)
+
+async def _block_resources(page: Page, resource_types: FrozenSet[str]) -> None:
+    """Stop a page from downloading resources of the given types."""
+    async def route_request(route: Route) -> None:
+        # Abort requests for blocked resource types and let everything else through
+        if route.request.resource_type in resource_types:
+            await route.abort()
+        else:
+            await route.fallback()
+
+    await page.route("**/*", route_request)
+
+# Response headers that describe the body as sent over the network. Cached bodies are
+# stored decoded, so these no longer apply when a response is replayed from disk
+_UNCACHED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+# Redirect responses are stored too, so cached pages replay without network access
+_CACHED_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+def _cache_key(request: Request) -> str:
+    """Key a request by its URL without the fragment, and a hash of its body."""
+    url = urldefrag(request.url).url
+    body = request.post_data_buffer or b""
+    return hashlib.sha1(url.encode() + b"\0" + hashlib.sha1(body).digest()).hexdigest()
+
+def _read_cache_entry(path: str, ttl: float) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+    """Read the status, headers and body of a cache entry, or None if it is missing, stale or broken."""
+    try:
+        if time.time() - os.path.getmtime(path + ".json") >= ttl:
+            return None
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        with open(path + ".body", "rb") as f:
+            return meta["status"], meta["headers"], f.read()
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _write_atomically(path: str, data: bytes) -> None:
+    """Write a file through a temporary file next to it, so readers never see it half written."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _write_cache_entry(path: str, meta: Dict[str, Any], body: bytes) -> None:
+    """Store a cache entry. The metadata is written last, it marks a complete entry."""
+    _write_atomically(path + ".body", body)
+    _write_atomically(path + ".json", json.dumps(meta).encode())
+
+async def _cache_responses(page: Page, cache_dir: str, ttl: float) -> None:
+    """
+    Serve GET requests of a page from a disk cache, fetching and storing them on a miss.
+    
+    Entries are keyed by URL and a hash of the request body (see _cache_key), and
+    expire `ttl` seconds after they were stored. Only successful (2xx) and redirect
+    responses are stored. Redirects are handed to the browser instead of being
+    followed by the fetch, so the page ends up at the final URL as without the cache.
+    Meant for re-running scripts against the same pages during development.
+    
+    File I/O runs in a worker thread. Requests the cache fails on go to the network.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    async def route_request(route: Route) -> None:
+        request = route.request
+        if request.method != "GET":
+            await route.fallback()
+            return
+        
+        path = os.path.join(cache_dir, _cache_key(request))
+        entry = await asyncio.to_thread(_read_cache_entry, path, ttl)
+        if entry is not None:
+            status, headers, body = entry
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+        
+        try:
+            response = await route.fetch(max_redirects=0)
+            body = await response.body()
+        except Exception:
+            await route.fallback()
+            return
+        
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _UNCACHED_HEADERS}
+        if 200 <= response.status < 300 or response.status in _CACHED_REDIRECT_STATUSES:
+            meta = {"url": request.url, "status": response.status, "headers": headers}
+            try:
+                await asyncio.to_thread(_write_cache_entry, path, meta, body)
+            except OSError as e:
+                # The response was fetched already, serve it uncached
+                print(f"Warning: could not cache {request.url}: {e}")
+        await route.fulfill(status=response.status, headers=headers, body=body)
+
+    await page.route("**/*", route_request)
+
+async def _launch_browser(headless: bool) -> Tuple[Playwright, Browser]:
+    """Start a Playwright driver and launch Chromium, stopping the driver again if the launch fails."""
+    playwright = await async_playwright().start()
+    try:
+        browser = await playwright.chromium.launch(headless=headless)
+    except:
+        await playwright.stop()
+        raise
+    return playwright, browser
+
+# Playwright driver and browser shared by all automation instances running on the same
+# event loop. Launching Chromium dominates start-up time, so instances only open their
+# own browser context, which keeps their cookies and storage apart. The browser is
+# launched with the headless setting of the first user.
+# Set SCRAPESCRIPT_ISOLATED_BROWSER=1 to give every instance its own browser.
+_shared_browsers: Dict[asyncio.AbstractEventLoop, Dict[str, Any]] = {}
+
+def _use_shared_browser() -> bool:
+    """Whether automation instances should share the process-wide browser."""
+    return os.environ.get("SCRAPESCRIPT_ISOLATED_BROWSER", "") in ("", "0")
+
+async def _acquire_shared_browser(headless: bool) -> Browser:
+    """Get the browser shared on the running event loop, launching it on first use."""
+    loop = asyncio.get_running_loop()
+    shared = _shared_browsers.get(loop)
+    if shared is None:
+        # Locks and Playwright objects belong to the loop they were created on
+        shared = _shared_browsers[loop] = {"playwright": None, "browser": None, "users": 0, "lock": asyncio.Lock()}
+    
+    async with shared["lock"]:
+        if shared["browser"] is None:
+            try:
+                shared["playwright"], shared["browser"] = await _launch_browser(headless)
+            except:
+                if not shared["users"]:
+                    _shared_browsers.pop(loop, None)
+                raise
+        shared["users"] += 1
+        return shared["browser"]
+
+async def _release_shared_browser() -> None:
+    """Release the shared browser of the running event loop, shutting it down after the last user."""
+    loop = asyncio.get_running_loop()
+    shared = _shared_browsers[loop]
+    async with shared["lock"]:
+        shared["users"] -= 1
+        if shared["users"] > 0:
+            return
+        
+        del _shared_browsers[loop]
+        await shared["browser"].close()
+        await shared["playwright"].stop()
 
 class PlaywrightElement(Element):
-    """Playwright implementation of Element interface for tab-based navigation."""
+    """Playwright implementation of Element interface, shared by both Playwright backends."""
+    
+    __slots__ = ('_handle',)
+    
+    # Read text and attributes with a plain evaluate on the handle.
+    # Set to False to go through Playwright's text_content()/get_attribute().
+    fast_text: bool = True
     
     def __init__(self, handle: ElementHandle) -> None:
         self._handle = handle
@@ -19,66 +504,155 @@ class PlaywrightElement(Element):
         return [PlaywrightElement(handle) for handle in handles]
     
     async def text_content(self) -> str:
+        if self.fast_text:
+            return await self._handle.evaluate(_READ_ELEMENT_JS, None)
         return await self._handle.text_content() or ""
         
     async def get_attribute(self, name: str) -> Optional[str]:
+        if self.fast_text:
+            return await self._handle.evaluate(_READ_ELEMENT_JS, name)
         return await self._handle.get_attribute(name)
         
     async def click(self) -> None:
         await self._handle.click()
 
-class PlaywrightAutomation(BrowserAutomation):
+class PlaywrightAutomation(BrowserAutomation, name="playwright"):
     """
     Playwright implementation that uses tabs for navigation history.
     Each new URL opens in a new tab, and history navigation switches between tabs.
     This preserves page state when navigating back and forth.
+    
+    Only the most recent `max_live_tabs` history entries are kept open. Older tabs
+    are closed and replaced by their URL, and are re-opened when navigated back to.
     """
     
-    def __init__(self) -> None:
+    max_live_tabs: int = 5
+    navigation_timeout: float = 30000  # Milliseconds to wait for a server response, and then for the DOM
+    wait_for_timeout: float = 10000  # Milliseconds to wait for a `wait_for` selector
+    settle_timeout: float = 10.0  # Seconds to wait for the network to settle after goto
+    
+    def __init__(self, block_resources: Union[bool, Iterable[str]] = False, settle_navigation: bool = False,
+                 cache_dir: Optional[str] = None, cache_ttl: float = 3600.0) -> None:
+        """
+        Args:
+            block_resources: Skip downloading images, media, fonts and stylesheets, or
+                             only the given Playwright resource types (e.g. ["image"])
+            settle_navigation: After each goto, also wait for the network to go idle
+            cache_dir: Serve GET requests from a disk cache in this directory
+            cache_ttl: Seconds a cached response stays valid
+        """
+        self.blocked_resource_types: FrozenSet[str] = _blocked_resource_types(block_resources)
+        self.settle_navigation: bool = settle_navigation
+        self.cache_dir: Optional[str] = cache_dir
+        self.cache_ttl: float = cache_ttl
         self._playwright = None
         self._browser = None
         self._context = None  # Browser context (window)
-        self._tabs = []  # List of all tabs/pages
+        self._shared_browser = False  # Whether the browser is the process-wide one
+        self._tabs = []  # History entries: live pages, or the URL of an evicted tab
+        self._query_cache: QueryCache = {}  # Resolved flat selectors on the current tab
         self._current_tab_index = -1  # Index of current active tab
     
     @property
     def _current_page(self) -> Optional[Page]:
         """Get the currently active page/tab."""
         if 0 <= self._current_tab_index < len(self._tabs):
-            return self._tabs[self._current_tab_index]
+            tab = self._tabs[self._current_tab_index]
+            if isinstance(tab, Page):
+                return tab
         return None
     
+    async def _new_tab(self) -> Page:
+        """Open a new, blank tab in the context."""
+        page = await self._context.new_page()
+        # Routes registered last run first, so blocked requests never reach the cache
+        if self.cache_dir:
+            await _cache_responses(page, self.cache_dir, self.cache_ttl)
+        if self.blocked_resource_types:
+            await _block_resources(page, self.blocked_resource_types)
+        return page
+    
+    async def _open_tab(self, url: str) -> Page:
+        """Open a new tab in the context and navigate it to the URL."""
+        page = await self._new_tab()
+        try:
+            await _navigate(page, url, self.navigation_timeout)
+        except:
+            await page.close()
+            raise
+        return page
+    
+    async def _evict_tabs(self) -> None:
+        """Close the oldest live tabs beyond `max_live_tabs`, keeping their URLs."""
+        live = [i for i, tab in enumerate(self._tabs)
+                if isinstance(tab, Page) and i != self._current_tab_index]
+        for i in live[:max(0, len(live) + 1 - self.max_live_tabs)]:
+            page = self._tabs[i]
+            self._tabs[i] = page.url
+            await page.close()
+    
+    async def _activate_tab(self, index: int) -> None:
+        """Make the history entry at index current, re-opening it if it was evicted."""
+        # The tab we leave stays open, so its cached handles are disposed
+        await _dispose_cached(self._query_cache)
+        self._current_tab_index = index
+        tab = self._tabs[index]
+        if isinstance(tab, Page):
+            # Bring the tab into focus
+            await tab.bring_to_front()
+            return
+        
+        self._tabs[index] = await self._open_tab(tab)
+        await self._evict_tabs()
+    
     async def launch(self, headless: bool = True) -> None:
         """Launch browser and initialize with a blank page/tab."""
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=headless)
+        if _use_shared_browser():
+            self._browser = await _acquire_shared_browser(headless)
+            self._shared_browser = True
+        else:
+            self._playwright, self._browser = await _launch_browser(headless)
         
-        # Create a single browser context (window)
+        # Create a single browser context (window), with its own cookies and storage
         self._context = await self._browser.new_context()
-        
-        # Create initial tab within the context
-        initial_page = await self._context.new_page()
+        await self._open_initial_tab()
+    
+    async def _open_initial_tab(self) -> None:
+        """Start the history with a single blank tab."""
+        initial_page = await self._new_tab()
         await initial_page.goto("about:blank")
         self._tabs = [initial_page]
         self._current_tab_index = 0
     
-    async def goto(self, url: str) -> None:
+    async def goto(self, url: str, wait_for: Optional[str] = None) -> None:
         """Navigate to URL by opening a new tab and closing any forward tabs."""
+        await _dispose_cached(self._query_cache)
         # If we previously went back, truncate the tab list
         if self._current_tab_index < len(self._tabs) - 1:
             # Close any tabs that would be "ahead" in history
             for tab in self._tabs[self._current_tab_index + 1:]:
-                await tab.close()
+                if isinstance(tab, Page):
+                    await tab.close()
             # Remove closed tabs from our list
             self._tabs = self._tabs[:self._current_tab_index + 1]
         
         # Create a new tab and navigate to the URL
-        new_page = await self._context.new_page()
-        await new_page.goto(url, wait_until="domcontentloaded")
+        new_page = await self._open_tab(url)
         
         # Add the new tab and make it current
         self._tabs.append(new_page)
         self._current_tab_index = len(self._tabs) - 1
+        await self._evict_tabs()
+        
+        if self.settle_navigation:
+            await _wait_for_settled(new_page, self.settle_timeout)
+        if wait_for:
+            await new_page.wait_for_selector(wait_for, state="attached", timeout=self.wait_for_timeout)
+    
+    async def wait_for_settled(self, timeout: float = 10.0) -> None:
+        """Wait for the network of the current tab to go idle."""
+        if self._current_page:
+            await _wait_for_settled(self._current_page, timeout)
     
     async def get_current_url(self) -> str:
         """Get the URL of the current page."""
@@ -104,6 +678,67 @@ class PlaywrightAutomation(BrowserAutomation):
         handles = await self._current_page.query_selector_all(selector)
         return [PlaywrightElement(handle) for handle in handles]
     
+    async def resolve_selector(self, selector: Selector) -> Optional[Element]:
+        """Resolve a nested selector in the current tab with a single evaluate call."""
+        if not self._current_page:
+            return None
+
+        handles = await _resolve_cached(self._query_cache, self._current_page, selector, first=True)
+        return PlaywrightElement(handles[0]) if handles else None
+
+    async def resolve_all(self, selector: Selector) -> List[Element]:
+        """Resolve a nested selector to all matching elements in the current tab."""
+        if not self._current_page:
+            return []
+
+        handles = await _resolve_cached(self._query_cache, self._current_page, selector, first=False)
+        return [PlaywrightElement(handle) for handle in handles]
+    
+    async def first_matching(self, selectors: List[Selector]) -> Tuple[int, int]:
+        """Find the first selector with matches in the current tab in one round-trip."""
+        if not self._current_page:
+            return -1, 0
+        return await _first_matching(self._current_page, selectors)
+    
+    async def evaluate_exists(self, tree: ExistsTree) -> bool:
+        """Evaluate an existence condition tree in the current tab in one round-trip."""
+        if not self._current_page:
+            return False
+        return await _evaluate_exists(self._current_page, tree)
+    
+    async def extract_from_elements(self, elements: List[Element],
+                                    fields: List[ExtractField]) -> List[List[List[Any]]]:
+        """Read fields below all elements in the current tab in one round-trip."""
+        if not self._current_page or not elements:
+            return []
+        return await _extract_from_elements(self._current_page, elements, fields)
+    
+    async def extract_first(self, selectors: List[Selector],
+                            attribute: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """Read from the first element of the first matching selector in the current tab in one round-trip."""
+        if not self._current_page:
+            return -1, None
+        return await _read_first(self._current_page, selectors, attribute)
+    
+    async def extract_first_matching(self, selectors: List[Selector],
+                                     attribute: Optional[str] = None) -> Tuple[int, List[Optional[str]]]:
+        """Read from the first selector with matches in the current tab in one round-trip."""
+        if not self._current_page:
+            return -1, []
+        return await _read_first_matching(self._current_page, selectors, attribute)
+    
+    async def extract_texts(self, selector: Selector) -> List[str]:
+        """Extract text content from all matching elements in one round-trip."""
+        if not self._current_page:
+            return []
+        return await _read_chain(self._current_page, selector, None)
+    
+    async def extract_attributes(self, selector: Selector, attribute: str) -> List[Optional[str]]:
+        """Extract an attribute from all matching elements in one round-trip."""
+        if not self._current_page:
+            return []
+        return await _read_chain(self._current_page, selector, attribute)
+    
     async def extract_text(self, element: Element) -> str:
         """Extract text content from element."""
         playwright_element = element
@@ -120,64 +755,61 @@ class PlaywrightAutomation(BrowserAutomation):
             return False
             
         try:
-            # Set up a navigation detector
-            navigation_occurred = False
-            async def on_navigation():
-                nonlocal navigation_occurred
-                navigation_occurred = True
-            
-            # Listen for navigation events
-            self._current_page.on("framenavigated", lambda _: on_navigation())
-            
-            # Perform the click
-            await playwright_element.click()
-            
-            # Short wait to detect if navigation happens
-            await self._current_page.wait_for_timeout(500)
-            
-            # Check if navigation occurred
-            if navigation_occurred:
-                print("ERROR: Navigation detected after click. Use goto_href instead for navigation.")
-                return False
-                
-            return True
+            if not await _click_navigates(self._current_page, playwright_element):
+                return True
+            print("ERROR: Navigation detected after click. Use goto_href instead for navigation.")
+            return False
         except Exception as e:
             # Click failed completely
             print(f"Click operation failed: {str(e)}")
             return False
+        finally:
+            # The click may have changed the page. The clicked element can come from
+            # the cache, so the handles are only disposed now
+            await _dispose_cached(self._query_cache)
             
     async def go_back(self) -> None:
         """Go back to previous tab."""
         if self._current_tab_index > 0:
-            self._current_tab_index -= 1
-            # Bring the tab into focus
-            await self._current_page.bring_to_front()
+            await self._activate_tab(self._current_tab_index - 1)
     
     async def go_forward(self) -> None:
         """Go forward to next tab."""
         if self._current_tab_index < len(self._tabs) - 1:
-            self._current_tab_index += 1
-            # Bring the tab into focus
-            await self._current_page.bring_to_front()
+            await self._activate_tab(self._current_tab_index + 1)
     
-    async def cleanup(self) -> None:
-        """Close all tabs and the browser."""
-        # Close all tabs
-        for tab in self._tabs:
-            try:
-                await tab.close()
-            except:
-                pass
+    async def reset(self) -> None:
+        """Start over from a single blank tab in a fresh context, dropping history, cookies and storage."""
+        self._query_cache.clear()
+        self._tabs = []
+        self._current_tab_index = -1
         
+        # Closing the context closes all of its tabs
+        await self._context.close()
+        self._context = await self._browser.new_context()
+        await self._open_initial_tab()
+    
+    async def cleanup(self) -> None:
+        """Close the context with all its tabs and the browser (or release the shared one)."""
         # Clear tab list
         self._tabs = []
         self._current_tab_index = -1
         
-        # Close browser context
+        # Close browser context, and with it all tabs
         if self._context:
-            await self._context.close()
+            try:
+                await self._context.close()
+            except:
+                pass
             self._context = None
         
+        # The shared browser is closed by its last user
+        if self._shared_browser:
+            self._browser = None
+            self._shared_browser = False
+            await _release_shared_browser()
+            return
+        
         # Close browser
         if self._browser:
             await self._browser.close()
@@ -1,48 +1,71 @@
-from typing import List, Optional, Any
-from playwright.async_api import async_playwright, ElementHandle, Page, Browser
-from browser.interface import BrowserAutomation, Element
+from typing import FrozenSet, Iterable, List, Optional, Any, Tuple, Union
+from browser.interface import BrowserAutomation, Element, ExistsTree, ExtractField
+from browser.selector import Selector
+from browser.playwright import (
+    PlaywrightElement, QueryCache, _resolve_cached, _dispose_cached, _read_chain, _first_matching, _read_first, _read_first_matching,
+    _use_shared_browser, _acquire_shared_browser, _release_shared_browser, _launch_browser,
+    _block_resources, _blocked_resource_types, _cache_responses, _navigate, _click_navigates, _wait_for_settled,
+    _evaluate_exists, _extract_from_elements
+)
 
-class PlaywrightElement(Element):
-    """Playwright implementation of Element interface."""
-    
-    def __init__(self, handle: ElementHandle) -> None:
-        self._handle = handle
-        
-    async def query(self, selector: str) -> Optional['Element']:
-        handle = await self._handle.query_selector(selector)
-        if handle:
-            return PlaywrightElement(handle)
-        return None
-        
-    async def query_all(self, selector: str) -> List['Element']:
-        handles = await self._handle.query_selector_all(selector)
-        return [PlaywrightElement(handle) for handle in handles]
-    
-    # These methods are implementation details, not part of the Element interface
-    async def text_content(self) -> str:
-        return await self._handle.text_content() or ""
-        
-    async def get_attribute(self, name: str) -> Optional[str]:
-        return await self._handle.get_attribute(name)
-        
-    async def click(self) -> None:
-        await self._handle.click()
-
-class PlaywrightSinglePageAutomation(BrowserAutomation):
+class PlaywrightSinglePageAutomation(BrowserAutomation, name="playwright_single_page"):
     """Playwright implementation of browser automation."""
     
-    def __init__(self) -> None:
+    navigation_timeout: float = 30000  # Milliseconds to wait for a server response, and then for the DOM
+    wait_for_timeout: float = 10000  # Milliseconds to wait for a `wait_for` selector
+    settle_timeout: float = 10.0  # Seconds to wait for the network to settle after goto
+    
+    def __init__(self, block_resources: Union[bool, Iterable[str]] = False, settle_navigation: bool = False,
+                 cache_dir: Optional[str] = None, cache_ttl: float = 3600.0) -> None:
+        """
+        Args:
+            block_resources: Skip downloading images, media, fonts and stylesheets, or
+                             only the given Playwright resource types (e.g. ["image"])
+            settle_navigation: After each goto, also wait for the network to go idle
+            cache_dir: Serve GET requests from a disk cache in this directory
+            cache_ttl: Seconds a cached response stays valid
+        """
+        self.blocked_resource_types: FrozenSet[str] = _blocked_resource_types(block_resources)
+        self.settle_navigation: bool = settle_navigation
+        self.cache_dir: Optional[str] = cache_dir
+        self.cache_ttl: float = cache_ttl
         self._playwright = None
         self._browser = None
+        self._context = None
         self._page = None
+        self._shared_browser = False
+        self._query_cache: QueryCache = {}  # Resolved flat selectors on the current page
     
     async def launch(self, headless: bool = True) -> None:
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=headless)
-        self._page = await self._browser.new_page()
+        if _use_shared_browser():
+            self._browser = await _acquire_shared_browser(headless)
+            self._shared_browser = True
+        else:
+            self._playwright, self._browser = await _launch_browser(headless)
+        await self._open_page()
+    
+    async def _open_page(self) -> None:
+        """Open the page in a new context, with its own cookies and storage."""
+        self._context = await self._browser.new_context()
+        self._page = await self._context.new_page()
+        
+        # Routes registered last run first, so blocked requests never reach the cache
+        if self.cache_dir:
+            await _cache_responses(self._page, self.cache_dir, self.cache_ttl)
+        if self.blocked_resource_types:
+            await _block_resources(self._page, self.blocked_resource_types)
+    
+    async def goto(self, url: str, wait_for: Optional[str] = None) -> None:
+        # Cached handles are released with the document the navigation replaces
+        self._query_cache.clear()
+        await _navigate(self._page, url, self.navigation_timeout)
+        if self.settle_navigation:
+            await _wait_for_settled(self._page, self.settle_timeout)
+        if wait_for:
+            await self._page.wait_for_selector(wait_for, state="attached", timeout=self.wait_for_timeout)
     
-    async def goto(self, url: str) -> None:
-        await self._page.goto(url)
+    async def wait_for_settled(self, timeout: float = 10.0) -> None:
+        await _wait_for_settled(self._page, timeout)
     
     async def get_current_url(self) -> str:
         """Get the URL of the current page."""
@@ -60,6 +83,40 @@ class PlaywrightSinglePageAutomation(BrowserAutomation):
         handles = await self._page.query_selector_all(selector)
         return [PlaywrightElement(handle) for handle in handles]
     
+    async def resolve_selector(self, selector: Selector) -> Optional[Element]:
+        handles = await _resolve_cached(self._query_cache, self._page, selector, first=True)
+        return PlaywrightElement(handles[0]) if handles else None
+    
+    async def resolve_all(self, selector: Selector) -> List[Element]:
+        handles = await _resolve_cached(self._query_cache, self._page, selector, first=False)
+        return [PlaywrightElement(handle) for handle in handles]
+    
+    async def first_matching(self, selectors: List[Selector]) -> Tuple[int, int]:
+        return await _first_matching(self._page, selectors)
+    
+    async def evaluate_exists(self, tree: ExistsTree) -> bool:
+        return await _evaluate_exists(self._page, tree)
+    
+    async def extract_from_elements(self, elements: List[Element],
+                                    fields: List[ExtractField]) -> List[List[List[Any]]]:
+        if not elements:
+            return []
+        return await _extract_from_elements(self._page, elements, fields)
+    
+    async def extract_first(self, selectors: List[Selector],
+                            attribute: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        return await _read_first(self._page, selectors, attribute)
+    
+    async def extract_first_matching(self, selectors: List[Selector],
+                                     attribute: Optional[str] = None) -> Tuple[int, List[Optional[str]]]:
+        return await _read_first_matching(self._page, selectors, attribute)
+    
+    async def extract_texts(self, selector: Selector) -> List[str]:
+        return await _read_chain(self._page, selector, None)
+    
+    async def extract_attributes(self, selector: Selector, attribute: str) -> List[Optional[str]]:
+        return await _read_chain(self._page, selector, attribute)
+    
     async def extract_text(self, element: Element) -> str:
         playwright_element = element  # Type cast would be better here
         return await playwright_element.text_content()
@@ -71,19 +128,48 @@ class PlaywrightSinglePageAutomation(BrowserAutomation):
     async def click(self, element: Element) -> bool:
         playwright_element = element  # Type cast would be better here
         try:
-            async with self._page.expect_navigation(timeout=5000, wait_until="networkidle"):
-                await playwright_element.click()
+            # Navigations only wait for the DOM, not for the network to go idle
+            if await _click_navigates(self._page, playwright_element):
+                await self._page.wait_for_load_state("domcontentloaded", timeout=self.navigation_timeout)
             return True
         except:
             return False
+        finally:
+            # The click may have changed the page. The clicked element can come from
+            # the cache, so the handles are only disposed now
+            await _dispose_cached(self._query_cache)
     
     async def go_back(self) -> None:
-        await self._page.go_back()
+        self._query_cache.clear()
+        await self._page.go_back(wait_until="domcontentloaded", timeout=self.navigation_timeout)
     
     async def go_forward(self) -> None:
-        await self._page.go_forward()
+        self._query_cache.clear()
+        await self._page.go_forward(wait_until="domcontentloaded", timeout=self.navigation_timeout)
+    
+    async def reset(self) -> None:
+        """Start over on a blank page in a fresh context, dropping history, cookies and storage."""
+        self._query_cache.clear()
+        await self._context.close()
+        await self._open_page()
     
     async def cleanup(self) -> None:
+        # Closing the context closes the page
+        self._page = None
+        if self._context:
+            try:
+                await self._context.close()
+            except:
+                pass
+            self._context = None
+        
+        if self._shared_browser:
+            # The browser is closed by its last user
+            self._browser = None
+            self._shared_browser = False
+            await _release_shared_browser()
+            return
+        
         if self._browser:
             await self._browser.close()
             self._browser = None
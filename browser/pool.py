@@ -0,0 +1,124 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from browser.interface import BrowserAutomation
+from browser.factory import BrowserFactory
+
+class BrowserPool:
+    """
+    Pool of launched browser automation instances shared between scrape jobs.
+    
+    Browsers are launched lazily on first use, up to `size` instances. Released
+    browsers are reset and handed to the next job instead of being shut down, so
+    batch workloads only pay the browser start-up cost once per pooled instance.
+    
+    There is no reliable way to run async cleanup at interpreter exit, so close
+    the pool explicitly with `close()` or use it as an async context manager.
+    """
+    
+    def __init__(self, implementation: str = "playwright", size: int = 2, headless: bool = True,
+                 browser_options: Optional[Dict[str, Any]] = None) -> None:
+        if size < 1:
+            raise ValueError(f"Browser pool size must be at least 1, got {size}")
+        
+        self.implementation: str = implementation
+        self.size: int = size
+        self.headless: bool = headless
+        self.browser_options: Dict[str, Any] = browser_options or {}
+        
+        self._idle: List[BrowserAutomation] = []  # Launched browsers waiting for a job
+        self._launched: List[BrowserAutomation] = []  # Every browser owned by the pool, including ones being launched
+        self._changed: Optional[asyncio.Condition] = None  # Notified when a browser or a free slot becomes available
+        self._closed: bool = False
+    
+    def _condition(self) -> asyncio.Condition:
+        """Get the pool's condition, created on first use so the pool can be built outside of an event loop."""
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+    
+    async def acquire(self) -> BrowserAutomation:
+        """
+        Borrow a browser, launching a new one if none is idle and the pool is not full yet.
+        
+        Waits for a browser to be released if the pool is full. Raises RuntimeError if
+        the pool is closed.
+        """
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(lambda: self._closed or self._idle or len(self._launched) < self.size)
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            if self._idle:
+                return self._idle.pop(0)
+            
+            # Take the slot before launching, so concurrent jobs can't overfill the pool
+            automation = BrowserFactory.create(self.implementation, **self.browser_options)
+            self._launched.append(automation)
+        
+        try:
+            await automation.launch(headless=self.headless)
+        except Exception:
+            await self._discard(automation)
+            raise
+        if self._closed:
+            # The pool was closed during the launch
+            await automation.cleanup()
+            raise RuntimeError("Browser pool is closed")
+        return automation
+    
+    async def release(self, automation: BrowserAutomation) -> None:
+        """
+        Return a borrowed browser to the pool, discarding it if it cannot be reset.
+        
+        A discarded browser frees its slot, so a job waiting for a browser launches a
+        replacement. Browsers released after the pool was closed are cleaned up instead.
+        """
+        if self._closed or automation not in self._launched:
+            await automation.cleanup()
+            return
+        
+        try:
+            await automation.reset()
+        except Exception:
+            await self._discard(automation)
+            await automation.cleanup()
+            return
+        
+        changed = self._condition()
+        async with changed:
+            # A pool closed during the reset has already cleaned the browser up
+            if not self._closed:
+                self._idle.append(automation)
+                changed.notify()
+    
+    async def _discard(self, automation: BrowserAutomation) -> None:
+        """Drop a browser from the pool and wake a job waiting for a free slot."""
+        changed = self._condition()
+        async with changed:
+            if automation in self._launched:
+                self._launched.remove(automation)
+            changed.notify()
+    
+    async def close(self) -> None:
+        """
+        Shut down every browser owned by the pool.
+        
+        Jobs waiting for a browser get a RuntimeError, and the pool can't be used again.
+        """
+        self._closed = True
+        launched, self._launched = self._launched, []
+        self._idle = []
+        if self._changed is not None:
+            async with self._changed:
+                self._changed.notify_all()
+        for automation in launched:
+            try:
+                await automation.cleanup()
+            except Exception:
+                pass
+    
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
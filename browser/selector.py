@@ -1,17 +1,74 @@
-from typing import Optional, Union
+from typing import Any, Optional, Tuple
+
+# Flattened selector: (css_selector, index) pairs from the outermost parent inwards
+SelectorChain = Tuple[Tuple[str, Optional[int]], ...]
 
 class Selector:
     """
     Represents a CSS selector that can be chained to represent nested element queries.
     When parent is provided, first find elements matching the parent selector,
     then find children within those elements using this selector's css_selector.
+    
+    A selector can also carry an element that was already resolved for it (e.g. the
+    current element of a foreach loop). Queries then start from that element instead
+    of resolving its CSS selector again, see anchored().
+    
+    Selectors are treated as immutable once created, which allows the flattened
+    chain to be computed once and reused.
     """
+    
+    # A selector is created for most statements of every loop iteration, keep them lean
+    __slots__ = ('css_selector', 'parent', 'index', 'element', '_chain', '_anchored')
+    
     def __init__(
         self, 
         css_selector: Optional[str],
         parent: Optional['Selector'] = None,
-        index: Optional[int] = None
+        index: Optional[int] = None,
+        element: Optional[Any] = None
     ):
         self.css_selector = css_selector  # The CSS selector text
         self.parent = parent              # Parent selector if this is a nested query
-        self.index = index                # Index to use if selecting from a list
\ No newline at end of file
+        self.index = index                # Index to use if selecting from a list
+        self.element = element            # Already resolved Element this selector stands for
+        self._chain: Optional[SelectorChain] = None  # Memoized result of chain()
+        self._anchored: Optional[Tuple[Optional[Any], SelectorChain]] = None  # Memoized result of anchored()
+
+    def chain(self) -> SelectorChain:
+        """
+        Flatten this selector and its parents into (css_selector, index) pairs,
+        ordered from the outermost parent to this selector.
+        Levels without a CSS selector are skipped, as they resolve to their parent.
+        """
+        if self._chain is None:
+            pairs = []
+            selector: Optional[Selector] = self
+            while selector is not None:
+                if selector.css_selector is not None:
+                    pairs.append((selector.css_selector, selector.index))
+                selector = selector.parent
+            pairs.reverse()
+            self._chain = tuple(pairs)
+        return self._chain
+
+    def anchored(self) -> Tuple[Optional[Any], SelectorChain]:
+        """
+        Split this selector at the nearest level that carries a resolved element.
+        
+        Returns that element (None if no level has one) and the flattened chain of
+        the levels below it, which are resolved relative to the element.
+        """
+        if self._anchored is None:
+            pairs = []
+            element = None
+            selector: Optional[Selector] = self
+            while selector is not None:
+                if selector.element is not None:
+                    element = selector.element
+                    break
+                if selector.css_selector is not None:
+                    pairs.append((selector.css_selector, selector.index))
+                selector = selector.parent
+            pairs.reverse()
+            self._anchored = (element, tuple(pairs))
+        return self._anchored
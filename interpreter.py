@@ -1,15 +1,22 @@
+import asyncio
+import logging
 from datetime import datetime
-from typing import List, Dict, Any, cast, Optional, Set
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Set, Tuple
 from parser import NodeType, ASTNode
-from browser.interface import BrowserAutomation, Element
-from browser.selector import Selector
+from browser.interface import BrowserAutomation, Element, ExtractField
+from browser.selector import Selector, SelectorChain
 from browser.factory import BrowserFactory
+from browser.pool import BrowserPool
 import traceback
 from urllib.parse import urlparse
 import csv
 import json
 import re
 
+# Execution details of non-verbose interpreters are logged at DEBUG level, wherever
+# the application configures logging to send them (see Interpreter._log)
+logger = logging.getLogger(__name__)
+
 
 class Interpreter:
     """
@@ -19,24 +26,82 @@ class Interpreter:
     """
     _current_instance = None
 
+    # Probe fallback selectors concurrently instead of one after the other.
+    # Disable when selector probes must not overlap.
+    batch_parallel: bool = True
+    
+    # Evaluate conditions built only from exists/and/or/not with one browser call
+    # instead of one call per exists check
+    batch_conditions: bool = True
+    
+    # Statements that only read the page and write their own column, which makes
+    # consecutive runs of them safe to execute concurrently
+    PARALLEL_SAFE_TYPES = frozenset({
+        NodeType.EXTRACT,
+        NodeType.EXTRACT_LIST,
+        NodeType.EXTRACT_ATTRIBUTE,
+        NodeType.EXTRACT_ATTRIBUTE_LIST,
+    })
+    
+    # Statements that only write their own column without waiting on the browser. They
+    # don't end a run of parallel-safe statements, but run inline instead of as tasks
+    PARALLEL_INLINE_TYPES = frozenset({
+        NodeType.TIMESTAMP,
+        NodeType.SET_FIELD,
+    })
+    
+    # Read the extract statements of simple foreach bodies for all elements with one
+    # browser call per loop, instead of one call per statement and element
+    prefetch_foreach: bool = True
+    
+    # Statements a foreach body may consist of to be read up front: none of them
+    # changes the page or branches
+    PREFETCH_BODY_TYPES = frozenset({
+        NodeType.EXTRACT,
+        NodeType.EXTRACT_LIST,
+        NodeType.EXTRACT_ATTRIBUTE,
+        NodeType.EXTRACT_ATTRIBUTE_LIST,
+        NodeType.SET_FIELD,
+        NodeType.TIMESTAMP,
+        NodeType.SAVE_ROW,
+        NodeType.CLEAR_ROW,
+        NodeType.LOG,
+    })
+    
+    # Safety limit on the iterations of a single while loop, to stop infinite loops
+    max_while_iterations: int = 1000
+    
+    # Maximum number of selectors kept by create_selector before the cache is reset
+    selector_cache_size: int = 1024
+    
+    # Settings above that execute_concurrently copies to its worker interpreters, so
+    # overrides on the instance apply to every data row
+    TUNING_ATTRIBUTES = ('batch_parallel', 'batch_conditions', 'prefetch_foreach',
+                         'max_while_iterations', 'selector_cache_size')
+
     @classmethod
     def get_current_instance(cls):
         """Return the current active interpreter instance."""
         return cls._current_instance
 
-    def __init__(self, ast: ASTNode, verbose: bool = False) -> None:
+    def __init__(self, ast: ASTNode, verbose: bool = False,
+                 row_sink: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
         """
         Initialize the interpreter with an abstract syntax tree.
         
         Args:
             ast: Root node of the parsed script
             verbose: Whether to output detailed execution logs
+            row_sink: Optional callable that receives each saved row. When given, rows
+                      are streamed to it instead of being collected in `rows`
         """
         self.ast: ASTNode = ast
         self.verbose: bool = verbose
 
         self.current_row: Dict[str, Any] = {}  # Current data row being assembled
-        self.rows: List[Dict[str, Any]] = []  # Collected data rows
+        self.rows: List[Dict[str, Any]] = []  # Collected data rows (empty when streaming)
+        self.row_sink: Optional[Callable[[Dict[str, Any]], None]] = row_sink
+        self.row_count: int = 0  # Number of rows saved, including streamed ones
         
         # Data schema variables and their values
         self.data_schema: Dict[str, str] = {}  # Map of variable names to column names
@@ -47,25 +112,81 @@ class Interpreter:
         self.element_references: Dict[str, str] = {}
         # Track current index for each foreach loop variable
         self.foreach_indexes: Dict[str, int] = {}
+        # Elements resolved by each running foreach loop, with the page version they belong to
+        self._foreach_elements: Dict[str, Tuple[int, List[Element]]] = {}
+        # Bumped whenever the page may have been replaced, which invalidates resolved elements
+        self._dom_version: int = 0
+        # Selectors built by create_selector, keyed by the string and the reference it uses
+        self._selector_cache: Dict[tuple, Selector] = {}
+        # Constant selectors of nodes, keyed by id() of the node (see node_selectors)
+        self._node_selectors: Dict[int, tuple] = {}
+        # Compiled condition predicates, keyed by id() of the condition node (see compile_condition)
+        self._compiled_conditions: Dict[int, tuple] = {}
+        # Execution plans of statement lists, keyed by id() of the list (see execute_block)
+        self._block_plans: Dict[int, tuple] = {}
+        # Prefetch plans of foreach nodes, keyed by id() of the node (see _foreach_prefetch_plan)
+        self._foreach_plans: Dict[int, tuple] = {}
+        # Values read up front for the current foreach iteration, keyed by id() of the statement
+        self._prefetched: Dict[int, List[Any]] = {}
+        # Results of exists checks while an if statement picks its branch, keyed by
+        # the resolved selector strings (see execute_if). None outside of that scope
+        self._exists_results: Optional[Dict[Tuple[str, ...], bool]] = None
         
         # Stack to track row state at different loop nesting levels
         self.row_state_stack: List[Dict[str, Any]] = []
 
+        # Handlers for each executable node type, used by execute_node
+        self._dispatch: Dict[NodeType, Callable[[ASTNode], Awaitable[bool]]] = {
+            NodeType.PROGRAM: self.execute_program,
+            NodeType.GOTO_URL: self.execute_goto_url,
+            NodeType.GOTO_HREF: self.execute_goto_href,
+            NodeType.EXTRACT: self.execute_extract,
+            NodeType.EXTRACT_LIST: self.execute_extract_list,
+            NodeType.EXTRACT_ATTRIBUTE: self.execute_extract_attribute,
+            NodeType.EXTRACT_ATTRIBUTE_LIST: self.execute_extract_attribute_list,
+            NodeType.SAVE_ROW: self.execute_save_row,
+            NodeType.CLEAR_ROW: self.execute_clear_row,
+            NodeType.SET_FIELD: self.execute_set_field,
+            NodeType.CLICK: self.execute_click,
+            NodeType.HISTORY_BACK: self.execute_history_back,
+            NodeType.HISTORY_FORWARD: self.execute_history_forward,
+            NodeType.LOG: self.execute_log,
+            NodeType.THROW: self.execute_throw,
+            NodeType.TIMESTAMP: self.execute_timestamp,
+            NodeType.EXIT: self.execute_exit,
+            NodeType.IF: self.execute_if,
+            NodeType.FOREACH: self.execute_foreach,
+            NodeType.WHILE: self.execute_while,
+            NodeType.SELECT: self.execute_select,
+            NodeType.DATA_SCHEMA: self.execute_data_schema,
+        }
+
         # Browser automation interface (initialized during execution)
         self.browser_automation: Optional[BrowserAutomation] = None
 
         # Register as current instance
         Interpreter._current_instance = self
 
-    def _log(self, message: str) -> None:
-        """Log a message if verbose mode is enabled."""
+    def _log(self, message: str, *args: Any) -> None:
+        """
+        Log a debug message. Verbose interpreters print it to stdout, others log it
+        at DEBUG level.
+        
+        Hot paths pass printf-style args instead of an f-string, so the message is
+        only formatted when it is printed or debug logging is enabled.
+        """
         if self.verbose:
-            print(f"[Interpreter] {message}")
+            print(f"[Interpreter] {message % args if args else message}")
+        else:
+            logger.debug(message, *args)
 
     def create_selector(self, selector_str: str) -> Selector:
         """
         Create a Selector object from a selector string, resolving variable references.
         
+        Selectors are immutable, so the same object is reused for as long as the string
+        and the element reference (CSS and foreach index) it points to are unchanged.
+        
         Handles three patterns:
         - '@var_name .child-selector': Variable reference + descendant selector
         - '@var_name': Direct variable reference
@@ -74,107 +195,127 @@ class Interpreter:
         Returns:
             A resolved Selector object
         """
-        # Variable reference with additional selector: '@var_name .some-class'
-        if ' ' in selector_str and selector_str.startswith('@'):
-            # Split at first space
-            var_name, child_selector = selector_str.split(' ', 1)
-            
-            # Look up the variable reference
-            if var_name not in self.element_references:
-                raise ValueError(f"Unknown element reference: {var_name}")
-            
-            # Get the actual CSS selector that the reference points to
-            parent_css = self.element_references[var_name]
-            
-            # Create a parent selector using the actual CSS value
-            parent_selector = Selector(parent_css)
-            
-            # If this is a foreach variable, apply the current index
-            if var_name in self.foreach_indexes:
-                parent_selector.index = self.foreach_indexes[var_name]
-            
-            # Create a child selector with the parent
-            return Selector(child_selector, parent=parent_selector)
-            
-        elif selector_str.startswith('@'):
-            # Direct variable reference
-            var_name = selector_str
-            
-            if var_name not in self.element_references:
-                raise ValueError(f"Unknown element reference: {var_name}")
-            
-            # Get the actual CSS selector value, not the reference name
-            css_selector = self.element_references[var_name]
-            selector = Selector(css_selector)
-            
-            # If this is a foreach variable, apply the current index
-            if var_name in self.foreach_indexes:
-                selector.index = self.foreach_indexes[var_name]
-                
-            return selector
+        # A single scan tells the three patterns apart
+        var_name = None
+        space = -1
+        if selector_str[:1] == '@':
+            space = selector_str.find(' ')
+            var_name = selector_str[:space] if space > 0 else selector_str
+            key = (selector_str, self.element_references.get(var_name), self.foreach_indexes.get(var_name),
+                   self._foreach_element(var_name))
+        else:
+            key = (selector_str,)
+        
+        selector = self._selector_cache.get(key)
+        if selector is None:
+            if len(self._selector_cache) >= self.selector_cache_size:
+                self._selector_cache.clear()
+            selector = self._selector_cache[key] = self._build_selector(selector_str, var_name, space, key[-1])
+        return selector
 
+    def _foreach_element(self, var_name: str) -> Optional[Element]:
+        """
+        Get the element a foreach variable currently points to, if the loop resolved
+        its elements and the page has not changed since.
+        """
+        entry = self._foreach_elements.get(var_name)
+        if entry is None or entry[0] != self._dom_version:
+            return None
+        return entry[1][self.foreach_indexes[var_name]]
+
+    def _build_selector(self, selector_str: str, var_name: Optional[str], space: int,
+                        element: Optional[Element] = None) -> Selector:
+        """Build a new Selector for create_selector from its already scanned string."""
         # Regular CSS selector
-        return Selector(selector_str)
+        if var_name is None:
+            return Selector(selector_str)
+        
+        element_references = self.element_references
+        if var_name not in element_references:
+            raise ValueError(f"Unknown element reference: {var_name}")
+        
+        # Get the actual CSS selector that the reference points to, not the reference name.
+        # If this is a foreach variable, apply the current index and anchor queries to
+        # the element the loop already resolved
+        parent_selector = Selector(element_references[var_name], index=self.foreach_indexes.get(var_name),
+                                   element=element)
+        
+        # Variable reference with additional selector: '@var_name .some-class'
+        if space > 0:
+            return Selector(selector_str[space + 1:], parent=parent_selector)
+        
+        # Direct variable reference
+        return parent_selector
 
     def create_selectors(self, selector_strings: List[str]) -> List[Selector]:
         """Convert a list of selector strings to Selector objects."""
         return [self.create_selector(s) for s in selector_strings]
 
+    def node_selectors(self, node: ASTNode, substitute: bool = True) -> Tuple[List[str], List[Selector]]:
+        """
+        Get the selector strings of a node (after $variable substitution, unless disabled)
+        and their Selector objects.
+        
+        Nodes whose selectors contain neither @references nor substituted $variables
+        always produce the same Selectors, so those are computed once per node.
+        """
+        cached = self._node_selectors.get(id(node))
+        if cached is not None:
+            return cached[1], cached[2]
+
+        selectors: List[str] = node.selectors
+        if substitute:
+            resolved_selectors = [self.substitute_variables(selector) for selector in selectors]
+        else:
+            resolved_selectors = selectors
+        selector_objects = self.create_selectors(resolved_selectors)
+
+        if not any(selector[:1] == '@' or (substitute and '$' in selector) for selector in selectors):
+            # Keep the node alive with its selectors, so its id() is not reused
+            self._node_selectors[id(node)] = (node, resolved_selectors, selector_objects)
+        return resolved_selectors, selector_objects
+
     async def resolve_selector(self, selector: Selector) -> Optional[Element]:
         """
         Resolve a Selector to an actual page Element.
         
-        Handles nested selectors (with parents) and indexed elements.
+        Handles nested selectors (with parents) and indexed elements. The whole
+        selector chain is handed to the browser automation, which can resolve it
+        in a single round-trip.
         
         Returns:
             The matched Element or None if not found
         """
-        if selector.parent is None:
-            # Direct page query
-            if selector.css_selector is None:
-                return None
-
-            # If we have an index, get all elements and select the one at the index
-            if selector.index is not None:
-                elements = await self.browser_automation.query_selector_all(selector.css_selector)
-                if elements and 0 <= selector.index < len(elements):
-                    return elements[selector.index]
-                self._log(f"Error: Index {selector.index} out of range for selector '{selector.css_selector}' (found {len(elements) if elements else 0} elements)")
-                return None
-            else:
-                return await self.browser_automation.query_selector(selector.css_selector)
-
-        # Resolve parent first
-        parent_element = await self.resolve_selector(selector.parent)
-        if parent_element is None:
-            return None
-
-        # No additional selector needed?
-        if selector.css_selector is None:
-            return parent_element
-
-        # If we have an index, get all elements and select the one at the index
-        if selector.index is not None:
-            elements = await parent_element.query_all(selector.css_selector)
-            if elements and 0 <= selector.index < len(elements):
-                return elements[selector.index]
-            self._log(f"Error: Index {selector.index} out of range for child selector '{selector.css_selector}' (found {len(elements) if elements else 0} elements)")
-            return None
-        else:
-            # Query within parent
-            return await parent_element.query(selector.css_selector)
+        return await self.browser_automation.resolve_selector(selector)
 
     async def resolve_selectors(self, selectors: List[Selector]) -> Optional[Element]:
         """
         Try each selector in the list and return the first one that resolves to an element.
         
+        All candidates are resolved concurrently (see batch_parallel), so the lookup
+        costs the slowest probe rather than the sum of all probes. The result is still
+        the first match in list order.
+        
         Returns:
             The first matched Element or None if none match
         """
-        for selector in selectors:
-            element = await self.resolve_selector(selector)
-            if element is not None:
-                return element
+        if not self.batch_parallel or len(selectors) < 2:
+            for selector in selectors:
+                element = await self.resolve_selector(selector)
+                if element is not None:
+                    return element
+            return None
+
+        results = await asyncio.gather(
+            *(self.resolve_selector(selector) for selector in selectors),
+            return_exceptions=True
+        )
+        for result in results:
+            # Surface errors in list order, as the sequential probe would
+            if isinstance(result, BaseException):
+                raise result
+            if result is not None:
+                return result
         return None
 
     async def resolve_all_elements(self, selector: Selector) -> List[Element]:
@@ -186,19 +327,7 @@ class Interpreter:
         Returns:
             List of matched Elements (empty list if none found)
         """
-        if selector.parent is None:
-            if selector.css_selector is None:
-                return []
-            return await self.browser_automation.query_selector_all(selector.css_selector)
-
-        parent_element = await self.resolve_selector(selector.parent)
-        if parent_element is None:
-            return []
-
-        if selector.css_selector is None:
-            return [parent_element]
-
-        return await parent_element.query_all(selector.css_selector)
+        return await self.browser_automation.resolve_all(selector)
 
     async def execute_goto_url(self, node: ASTNode) -> bool:
         """
@@ -207,13 +336,14 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        url: str = cast(str, node.url)
+        url: str = node.url
         
         # Apply variable substitution
         url = self.substitute_variables(url)
         
         await self.browser_automation.goto(url)
-        self._log(f"Navigated to: {url}")
+        self._dom_version += 1
+        self._log("Navigated to: %s", url)
         return True
 
     async def execute_goto_href(self, node: ASTNode) -> bool:
@@ -223,8 +353,8 @@ class Interpreter:
         Returns:
             True to continue script execution, False if navigation failed
         """
-        selectors: List[str] = cast(List[str], node.selectors)
-        selector_objects = self.create_selectors(selectors)
+        selectors: List[str] = node.selectors
+        _, selector_objects = self.node_selectors(node, substitute=False)
         element = await self.resolve_selectors(selector_objects)
 
         if element:
@@ -240,13 +370,14 @@ class Interpreter:
                     href = base_url + href
                 
                 await self.browser_automation.goto(href)
-                self._log(f"Navigated to href: {href}")
+                self._dom_version += 1
+                self._log("Navigated to href: %s", href)
                 return True
             else:
-                self._log(f"No href attribute found on element")
+                self._log("No href attribute found on element")
                 return False
         else:
-            self._log(f"No element found for selectors: {selectors}")
+            self._log("No element found for selectors: %s", selectors)
             return False
 
     async def execute_extract(self, node: ASTNode) -> bool:
@@ -256,22 +387,26 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        column_name: str = cast(str, node.column_name)
-        selectors: List[str] = cast(List[str], node.selectors)
+        column_name: str = node.column_name
         
         # Apply variable substitution to each selector
-        resolved_selectors = [self.substitute_variables(selector) for selector in selectors]
-        selector_objects = self.create_selectors(resolved_selectors)
+        resolved_selectors, selector_objects = self.node_selectors(node)
         
-        element = await self.resolve_selectors(selector_objects)
+        prefetched = self._prefetched.get(id(node))
+        if prefetched is not None:
+            # Read up front for the whole foreach loop
+            text = prefetched[0].strip() if prefetched else None
+        else:
+            # Resolve and read in one call, without creating an element handle
+            _, text = await self.browser_automation.extract_first(selector_objects)
+            text = text.strip() if text is not None else None
 
-        if element:
-            text = (await self.browser_automation.extract_text(element)).strip()
+        if text is not None:
             self.current_row[column_name] = text
-            self._log(f"Extracted '{column_name}': '{text[:50]}{'...' if len(text) > 50 else ''}'")
+            self._log("Extracted '%s': '%.50s%s'", column_name, text, '...' if len(text) > 50 else '')
         else:
             self.current_row[column_name] = None
-            self._log(f"Warning: No element found for '{column_name}' using selectors: {resolved_selectors}")
+            self._log("Warning: No element found for '%s' using selectors: %s", column_name, resolved_selectors)
 
         return True
 
@@ -282,26 +417,24 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        column_name: str = cast(str, node.column_name)
-        selectors: List[str] = cast(List[str], node.selectors)
-        selector_objects = self.create_selectors(selectors)
+        column_name: str = node.column_name
+        selectors: List[str] = node.selectors
+        _, selector_objects = self.node_selectors(node, substitute=False)
 
-        # Find all elements matching the first selector that works
-        texts = []
-        working_selector = None
-        
-        for i, selector in enumerate(selector_objects):
-            elements = await self.resolve_all_elements(selector)
-            if elements:
-                texts = [(await self.browser_automation.extract_text(el)).strip() for el in elements]
-                working_selector = selectors[i]
-                break
+        # Read all elements matching the first selector that works, in a single batch
+        prefetched = self._prefetched.get(id(node))
+        if prefetched is not None:
+            index, extracted = prefetched
+        else:
+            index, extracted = await self.browser_automation.extract_first_matching(selector_objects)
+        texts = [text.strip() for text in extracted]
+        working_selector = selectors[index] if index >= 0 else None
 
         self.current_row[column_name] = texts
         if texts:
-            self._log(f"Extracted list '{column_name}' with {len(texts)} items using '{working_selector}'")
+            self._log("Extracted list '%s' with %d items using '%s'", column_name, len(texts), working_selector)
         else:
-            self._log(f"Warning: No elements found for list '{column_name}' using any selectors")
+            self._log("Warning: No elements found for list '%s' using any selectors", column_name)
 
         return True
 
@@ -312,24 +445,27 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        column_name: str = cast(str, node.column_name)
-        selectors: List[str] = cast(List[str], node.selectors)
-        attribute: str = cast(str, node.attribute)
+        column_name: str = node.column_name
+        attribute: str = node.attribute
         
         # Apply variable substitution to selectors and attribute
-        resolved_selectors = [self.substitute_variables(selector) for selector in selectors]
+        resolved_selectors, selector_objects = self.node_selectors(node)
         resolved_attribute = self.substitute_variables(attribute)
         
-        selector_objects = self.create_selectors(resolved_selectors)
-        element = await self.resolve_selectors(selector_objects)
+        prefetched = self._prefetched.get(id(node))
+        if prefetched is not None:
+            # Read up front for the whole foreach loop
+            value = prefetched[0].strip() if prefetched and prefetched[0] is not None else None
+        else:
+            _, value = await self.browser_automation.extract_first(selector_objects, resolved_attribute)
+            value = value.strip() if value is not None else None
 
-        if element:
-            value = (await self.browser_automation.extract_attribute(element, resolved_attribute)).strip()
+        if value is not None:
             self.current_row[column_name] = value
-            self._log(f"Extracted '{column_name}' attribute '{resolved_attribute}': '{value[:50]}{'...' if len(value) > 50 else ''}'")
+            self._log("Extracted '%s' attribute '%s': '%.50s%s'", column_name, resolved_attribute, value, '...' if len(value) > 50 else '')
         else:
             self.current_row[column_name] = None
-            self._log(f"Warning: No element found for attribute '{resolved_attribute}' using selectors: {resolved_selectors}")
+            self._log("Warning: No element found for attribute '%s' using selectors: %s", resolved_attribute, resolved_selectors)
 
         return True
 
@@ -340,32 +476,28 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        column_name: str = cast(str, node.column_name)
-        selectors: List[str] = cast(List[str], node.selectors)
-        attribute: str = cast(str, node.attribute)
+        column_name: str = node.column_name
+        attribute: str = node.attribute
         
         # Apply variable substitution to each selector and the attribute
-        resolved_selectors = [self.substitute_variables(selector) for selector in selectors]
+        resolved_selectors, selector_objects = self.node_selectors(node)
         resolved_attribute = self.substitute_variables(attribute)
-        
-        selector_objects = self.create_selectors(resolved_selectors)
 
-        # Find all elements matching the first selector that works
-        values = []
-        working_selector = None
-        
-        for i, selector in enumerate(selector_objects):
-            elements = await self.resolve_all_elements(selector)
-            if elements:
-                values = [(await self.browser_automation.extract_attribute(el, resolved_attribute)).strip() for el in elements]
-                working_selector = resolved_selectors[i]
-                break
+        # Read all elements matching the first selector that works, in a single batch
+        prefetched = self._prefetched.get(id(node))
+        if prefetched is not None:
+            index, extracted = prefetched
+        else:
+            index, extracted = await self.browser_automation.extract_first_matching(selector_objects, resolved_attribute)
+        # Skip elements that don't carry the attribute
+        values = [value.strip() for value in extracted if value is not None]
+        working_selector = resolved_selectors[index] if index >= 0 else None
 
         self.current_row[column_name] = values
         if values:
-            self._log(f"Extracted attribute '{resolved_attribute}' list for '{column_name}' with {len(values)} items using '{working_selector}'")
+            self._log("Extracted attribute '%s' list for '%s' with %d items using '%s'", resolved_attribute, column_name, len(values), working_selector)
         else:
-            self._log(f"Warning: No elements found for attribute list '{column_name}.{resolved_attribute}' using any selectors")
+            self._log("Warning: No elements found for attribute list '%s.%s' using any selectors", column_name, resolved_attribute)
 
         return True
 
@@ -377,16 +509,20 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        # Add current row to results
-        self.rows.append(self.current_row.copy())
-        col_count = len(self.current_row)
-        self._log(f"Saved data row #{len(self.rows)} with {col_count} fields")
+        # Add current row to results, or stream it out. The row object itself is
+        # handed over, as current_row is replaced with a new dict right after
+        if self.row_sink is not None:
+            self.row_sink(self.current_row)
+        else:
+            self.rows.append(self.current_row)
+        self.row_count += 1
+        self._log("Saved data row #%d with %d fields", self.row_count, len(self.current_row))
         
         # Restore row state from the most recent loop context
         if self.row_state_stack:
             # Restore to the state before entering the loop
             self.current_row = self.row_state_stack[-1].copy()
-            self._log(f"Restored row state with {len(self.current_row)} fields from loop context")
+            self._log("Restored row state with %d fields from loop context", len(self.current_row))
         else:
             # Not in a loop, clear the row
             self.current_row = {}
@@ -403,7 +539,7 @@ class Interpreter:
         """
         field_count = len(self.current_row)
         self.current_row = {}
-        self._log(f"Cleared current row ({field_count} fields discarded)")
+        self._log("Cleared current row (%d fields discarded)", field_count)
         return True
 
     async def execute_set_field(self, node: ASTNode) -> bool:
@@ -413,15 +549,15 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        column_name: str = cast(str, node.column_name)
-        value: str = cast(str, node.value)
+        column_name: str = node.column_name
+        value: str = node.value
         
         # Apply variable substitution
         resolved_column_name = self.substitute_variables(column_name)
         resolved_value = self.substitute_variables(value)
         
         self.current_row[resolved_column_name] = resolved_value
-        self._log(f"Set field '{resolved_column_name}' = '{resolved_value}'")
+        self._log("Set field '%s' = '%s'", resolved_column_name, resolved_value)
         return True
 
     async def execute_click(self, node: ASTNode) -> bool:
@@ -431,24 +567,23 @@ class Interpreter:
         Returns:
             True to continue script execution, False if click failed
         """
-        selectors: List[str] = cast(List[str], node.selectors)
         
         # Apply variable substitution to each selector
-        resolved_selectors = [self.substitute_variables(selector) for selector in selectors]
-        selector_objects = self.create_selectors(resolved_selectors)
+        resolved_selectors, selector_objects = self.node_selectors(node)
         
         element = await self.resolve_selectors(selector_objects)
 
         if element:
             success = await self.browser_automation.click(element)
+            self._dom_version += 1
             if success:
-                self._log(f"Clicked element successfully")
+                self._log("Clicked element successfully")
                 return True
             else:
-                self._log(f"Error: Click operation failed (element might be blocked or not clickable)")
+                self._log("Error: Click operation failed (element might be blocked or not clickable)")
                 return False
         else:
-            self._log(f"Error: No clickable element found matching selectors: {resolved_selectors}")
+            self._log("Error: No clickable element found matching selectors: %s", resolved_selectors)
             return False
 
     async def execute_history_back(self, node: ASTNode) -> bool:
@@ -459,6 +594,7 @@ class Interpreter:
             True to continue script execution
         """
         await self.browser_automation.go_back()
+        self._dom_version += 1
         self._log("Navigated back in history")
         return True
 
@@ -470,6 +606,7 @@ class Interpreter:
             True to continue script execution
         """
         await self.browser_automation.go_forward()
+        self._dom_version += 1
         self._log("Navigated forward in history")
         return True
 
@@ -480,7 +617,7 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        message: str = cast(str, node.message)
+        message: str = node.message
         print(f"[Script Log] {message}")  # Always show user logs regardless of verbose setting
         return True
 
@@ -491,7 +628,7 @@ class Interpreter:
         Raises:
             Exception: Always raised with the provided message
         """
-        message: str = cast(str, node.message)
+        message: str = node.message
         raise Exception(f"Script error: {message}")
 
     async def execute_timestamp(self, node: ASTNode) -> bool:
@@ -501,10 +638,11 @@ class Interpreter:
         Returns:
             True to continue script execution
         """
-        column_name: str = cast(str, node.column_name)
+        column_name: str = node.column_name
+        
         timestamp = datetime.now().isoformat()
         self.current_row[column_name] = timestamp
-        self._log(f"Added timestamp to '{column_name}': {timestamp}")
+        self._log("Added timestamp to '%s': %s", column_name, timestamp)
         return True
 
     async def execute_exit(self, node: ASTNode) -> bool:
@@ -524,33 +662,30 @@ class Interpreter:
         Creates a variable reference that can be used in nested operations
         to refer to the current element in the iteration.
         """
-        selectors: List[str] = cast(List[str], node.selectors)
-        element_var_name: str = cast(str, node.element_var_name)
-        loop_body: List[ASTNode] = cast(List[ASTNode], node.loop_body)
+        selectors: List[str] = node.selectors
+        element_var_name: str = node.element_var_name
+        loop_body: List[ASTNode] = node.loop_body
 
         # Create selector objects from selector strings
-        selector_objects = self.create_selectors(selectors)
-
-        # Find first working selector and get matching elements
-        all_elements = []
-        working_selector = None
-        working_selector_str = None
-
-        for i, selector in enumerate(selector_objects):
-            try:
-                elements = await self.resolve_all_elements(selector)
-                if elements:
-                    all_elements = elements
-                    working_selector = selector
-                    working_selector_str = selectors[i]
-                    break
-            except Exception as e:
-                self._log(f"Error resolving selector '{selectors[i]}': {str(e)}")
-                continue
-
-        if not all_elements:
-            self._log(f"No elements found for foreach loop with selectors: {selectors}")
+        _, selector_objects = self.node_selectors(node, substitute=False)
+
+        # Find the first working selector and resolve its elements once, so statements
+        # in the loop body query within the current element instead of re-resolving
+        # the loop selector every iteration
+        index, elements = await self.browser_automation.resolve_first_matching(selector_objects)
+        element_count = len(elements)
+        if index < 0:
+            self._log("No elements found for foreach loop with selectors: %s", selectors)
             return True  # Continue execution despite no elements found
+        
+        working_selector = selector_objects[index]
+        working_selector_str = selectors[index]
+
+        # The loop variable shadows a reference of the same name (e.g. from an outer
+        # loop or a select) until the loop ends
+        outer_reference = self.element_references.get(element_var_name)
+        outer_index = self.foreach_indexes.get(element_var_name)
+        outer_elements = self._foreach_elements.get(element_var_name)
 
         # Store the CSS selector for variable references within the loop
         # Important: Store the actual CSS selector, not the reference with @
@@ -561,33 +696,38 @@ class Interpreter:
             # Fallback to the original selector string (this won't work if it has @references)
             self.element_references[element_var_name] = working_selector_str
 
-        self._log(f"Iterating through {len(all_elements)} elements using selector '{working_selector_str}'")
+        self._foreach_elements[element_var_name] = (self._dom_version, elements)
+
+        self._log("Iterating through %d elements using selector '%s'", element_count, working_selector_str)
+        prefetched = await self._prefetch_foreach(node, elements)
+        outer_prefetched = self._prefetched
         
         # Save current row state before entering the loop
         self.row_state_stack.append(self.current_row.copy())
-        self._log(f"Saved row state with {len(self.current_row)} fields before entering foreach loop")
+        self._log("Saved row state with %d fields before entering foreach loop", len(self.current_row))
 
         try:
             # Process each element in the collection
-            for i, element in enumerate(all_elements):
+            for i in range(element_count):
                 # Set the current iteration index
                 self.foreach_indexes[element_var_name] = i
+                if prefetched is not None:
+                    self._prefetched = prefetched[i]
                 
                 try:
-                    # Execute each statement in the loop body
-                    for statement in loop_body:
-                        should_continue = await self.execute_node(statement)
-                        if not should_continue:
-                            return False
+                    # Execute the statements in the loop body
+                    if not await self.execute_block(loop_body):
+                        return False
                 except Exception as e:
-                    self._log(f"Error in foreach iteration {i}/{len(all_elements)}: {str(e)}")
+                    self._log("Error in foreach iteration %d/%d: %s", i, element_count, e)
                     raise  # Re-raise to maintain error propagation
         finally:
-            # Clean up variable references after loop completion
-            if element_var_name in self.element_references:
-                del self.element_references[element_var_name]
-            if element_var_name in self.foreach_indexes:
-                del self.foreach_indexes[element_var_name]
+            # Clean up variable references after loop completion, restoring shadowed ones
+            self._restore_entry(self.element_references, element_var_name, outer_reference)
+            self._restore_entry(self.foreach_indexes, element_var_name, outer_index)
+            self._restore_entry(self._foreach_elements, element_var_name, outer_elements)
+            self._forget_element_selectors(elements)
+            self._prefetched = outer_prefetched
                 
             # Remove the row state for this loop
             if self.row_state_stack:
@@ -596,32 +736,125 @@ class Interpreter:
 
         return True
 
+    def _forget_element_selectors(self, elements: List[Element]) -> None:
+        """
+        Drop the cached selectors anchored to the elements of a finished foreach loop,
+        so the selector cache doesn't keep the elements alive for the rest of the run.
+        """
+        loop_elements = {id(element) for element in elements}
+        stale_keys = [key for key in self._selector_cache if len(key) == 4 and id(key[3]) in loop_elements]
+        for key in stale_keys:
+            del self._selector_cache[key]
+
+    @staticmethod
+    def _restore_entry(mapping: Dict[str, Any], key: str, value: Any) -> None:
+        """Put back a saved dict entry, or remove the key if there was none."""
+        if value is None:
+            mapping.pop(key, None)
+        else:
+            mapping[key] = value
+
+    async def _prefetch_foreach(self, node: ASTNode, elements: List[Element]) -> Optional[List[Dict[int, List[Any]]]]:
+        """
+        Read the extract statements of a foreach body for all loop elements in one call.
+        
+        Returns, per element, the values read keyed by id() of the statement (see
+        BrowserAutomation.extract_from_elements), or None if nothing was read up front.
+        """
+        if not self.prefetch_foreach:
+            return None
+        statements, fields = self._foreach_prefetch_plan(node)
+        if not statements:
+            return None
+        
+        try:
+            records = await self.browser_automation.extract_from_elements(elements, fields)
+        except Exception as e:
+            # Fall back to reading per element, which reports errors per statement
+            self._log("Could not read foreach body up front: %s", e)
+            return None
+        if len(records) != len(elements):
+            return None
+        
+        keys = [id(statement) for statement in statements]
+        return [dict(zip(keys, record)) for record in records]
+
+    def _foreach_prefetch_plan(self, node: ASTNode) -> Tuple[List[ASTNode], List[ExtractField]]:
+        """
+        Find the extract statements of a foreach body that can be read up front.
+        
+        The body must consist of PREFETCH_BODY_TYPES only, and a statement qualifies if
+        all its selectors select the loop element or below it, without $variables.
+        Plans are cached per foreach node.
+        
+        Returns the qualifying statements and their fields, both empty if there are none.
+        """
+        cached = self._foreach_plans.get(id(node))
+        if cached is not None:
+            return cached[1], cached[2]
+        
+        statements: List[ASTNode] = []
+        fields: List[ExtractField] = []
+        var_name: str = node.element_var_name
+        if all(statement.type in self.PREFETCH_BODY_TYPES for statement in node.loop_body):
+            for statement in node.loop_body:
+                if statement.type in (NodeType.EXTRACT, NodeType.EXTRACT_LIST):
+                    attribute = None
+                elif statement.type in (NodeType.EXTRACT_ATTRIBUTE, NodeType.EXTRACT_ATTRIBUTE_LIST):
+                    attribute = statement.attribute
+                    if '$' in attribute:
+                        continue
+                else:
+                    continue
+                
+                chains = [self._element_chain(selector, var_name) for selector in statement.selectors]
+                if None in chains:
+                    continue
+                many = statement.type in (NodeType.EXTRACT_LIST, NodeType.EXTRACT_ATTRIBUTE_LIST)
+                statements.append(statement)
+                fields.append((chains, attribute, many))
+        
+        # Keep the node alive with its plan, so its id() is not reused
+        self._foreach_plans[id(node)] = (node, statements, fields)
+        return statements, fields
+
+    @staticmethod
+    def _element_chain(selector_str: str, var_name: str) -> Optional[SelectorChain]:
+        """
+        Get the chain below a foreach element that a selector string selects, as
+        create_selector would build it, or None if the selector does not start at
+        the element or needs variable substitution.
+        """
+        if '$' in selector_str:
+            return None
+        if selector_str == var_name:
+            return ()
+        if selector_str.startswith(var_name + ' '):
+            return ((selector_str[len(var_name) + 1:], None),)
+        return None
+
     async def execute_select(self, node: ASTNode) -> bool:
         """
         Select elements using provided selectors and store as a named reference.
         
         Creates a variable that can be referenced in subsequent operations.
         """
-        selectors: List[str] = cast(List[str], node.selectors)
-        var_name: str = cast(str, node.element_var_name)
+        selectors: List[str] = node.selectors
+        var_name: str = node.element_var_name
 
         # Create selector objects
-        selector_objects = self.create_selectors(selectors)
+        _, selector_objects = self.node_selectors(node, substitute=False)
 
-        # Find the first working selector
-        working_selector_str = None
-        for i, selector in enumerate(selector_objects):
-            element = await self.resolve_selector(selector)
-            if element:
-                working_selector_str = selectors[i]
-                break
+        # Find the first working selector in one probe
+        index, _ = await self.browser_automation.first_matching(selector_objects)
+        working_selector_str = selectors[index] if index >= 0 else None
 
         if working_selector_str:
             # Store selector for future references
             self.element_references[var_name] = working_selector_str
-            self._log(f"Created reference '{var_name}' using selector '{working_selector_str}'")
+            self._log("Created reference '%s' using selector '%s'", var_name, working_selector_str)
         else:
-            self._log(f"Failed to create reference '{var_name}': no matching elements found")
+            self._log("Failed to create reference '%s': no matching elements found", var_name)
 
         return True
 
@@ -629,108 +862,163 @@ class Interpreter:
         """
         Evaluate a conditional expression and return the boolean result.
         
-        Handles EXISTS, AND, OR, NOT, and IS_EMPTY condition types.
+        Handles EXISTS, AND, OR, NOT, and IS_EMPTY condition types. Each condition
+        tree is compiled into a predicate once (see compile_condition) and reused.
         """
-        if node.type == NodeType.CONDITION_EXISTS:
-            selectors: List[str] = cast(List[str], node.selectors)
-            # Apply variable substitution to each selector
-            resolved_selectors = [self.substitute_variables(selector) for selector in selectors]
-            selector_objects = self.create_selectors(resolved_selectors)
+        return await self.compile_condition(node)()
 
-            # Check if any selector resolves to an element
-            for selector in selector_objects:
-                element = await self.resolve_selector(selector)
-                if element:
-                    return True
-            return False
+    def compile_condition(self, node: ASTNode) -> Callable[[], Awaitable[bool]]:
+        """
+        Compile a condition tree into an async predicate, with the short-circuiting
+        of AND/OR and the node type dispatch resolved once instead of per evaluation.
+        
+        Predicates are cached per condition node.
+        """
+        cached = self._compiled_conditions.get(id(node))
+        if cached is not None:
+            return cached[1]
+
+        if self.batch_conditions and node.type in self._EXISTS_TREE_OPERATORS and self._is_exists_tree(node):
+            async def predicate() -> bool:
+                # The whole tree is evaluated by the browser in one call
+                return await self.browser_automation.evaluate_exists(self._exists_tree(node))
+
+        elif node.type == NodeType.CONDITION_EXISTS:
+            # Selectors are checked in a single browser call that returns a boolean,
+            # without creating element handles for the matches
+            batch = self.batch_conditions
+
+            async def predicate() -> bool:
+                # Apply variable substitution to each selector
+                resolved_selectors, selector_objects = self.node_selectors(node)
+                results = self._exists_results
+                if results is not None:
+                    found = results.get(tuple(resolved_selectors))
+                    if found is not None:
+                        return found
+                
+                # Check if any selector resolves to an element
+                if batch:
+                    found = await self.browser_automation.evaluate_exists(["exists", selector_objects])
+                else:
+                    found = await self.resolve_selectors(selector_objects) is not None
+                if results is not None:
+                    results[tuple(resolved_selectors)] = found
+                return found
 
         elif node.type == NodeType.CONDITION_AND:
-            # Short-circuit evaluation for AND
-            left_result = await self.evaluate_condition(node.left)
-            if not left_result:
-                return False
-            return await self.evaluate_condition(node.right)
+            left, right = self.compile_condition(node.left), self.compile_condition(node.right)
+
+            async def predicate() -> bool:
+                # Short-circuit evaluation for AND
+                return await left() and await right()
 
         elif node.type == NodeType.CONDITION_OR:
-            # Short-circuit evaluation for OR
-            left_result = await self.evaluate_condition(node.left)
-            if left_result:
-                return True
-            return await self.evaluate_condition(node.right)
+            left, right = self.compile_condition(node.left), self.compile_condition(node.right)
+
+            async def predicate() -> bool:
+                # Short-circuit evaluation for OR
+                return await left() or await right()
 
         elif node.type == NodeType.CONDITION_NOT:
-            # Negate the evaluation of the operand
-            result = await self.evaluate_condition(node.operand)
-            return not result
-            
+            operand = self.compile_condition(node.operand)
+
+            async def predicate() -> bool:
+                # Negate the evaluation of the operand
+                return not await operand()
+
         elif node.type == NodeType.CONDITION_IS_EMPTY:
-            # Check if a variable or string value is empty
-            value = node.value
-            
-            # Apply variable substitution if this is a string
-            if isinstance(value, str):
-                if value.startswith('$'):
-                    # Direct variable reference
-                    value = self.resolve_variable(value)
-                else:
-                    # String that might contain variables
-                    value = self.substitute_variables(value)
+            raw_value = node.value
+
+            async def predicate() -> bool:
+                # Check if a variable or string value is empty
+                value = raw_value
                 
-            # Check if value is empty (None, empty string, empty list, etc.)
-            is_empty = value is None or value == '' or (hasattr(value, '__len__') and len(value) == 0)
-            self._log(f"Is_empty condition check: '{value}' -> {is_empty}")
-            return is_empty
+                # Apply variable substitution if this is a string
+                if isinstance(value, str):
+                    if value.startswith('$'):
+                        # Direct variable reference
+                        value = self.resolve_variable(value)
+                    else:
+                        # String that might contain variables
+                        value = self.substitute_variables(value)
+                    
+                # Check if value is empty (None, empty string, empty list, etc.)
+                is_empty = value is None or value == '' or (hasattr(value, '__len__') and len(value) == 0)
+                self._log("Is_empty condition check: '%s' -> %s", value, is_empty)
+                return is_empty
 
         else:
             raise ValueError(f"Unsupported condition type: {node.type}")
 
+        # Keep the node alive with its predicate, so its id() is not reused
+        self._compiled_conditions[id(node)] = (node, predicate)
+        return predicate
+
+    # Condition node types that map onto ExistsTree operators
+    _EXISTS_TREE_OPERATORS = {
+        NodeType.CONDITION_AND: "and",
+        NodeType.CONDITION_OR: "or",
+        NodeType.CONDITION_NOT: "not",
+    }
+
+    def _is_exists_tree(self, node: ASTNode) -> bool:
+        """Whether a condition consists only of EXISTS checks combined with AND/OR/NOT."""
+        if node.type == NodeType.CONDITION_EXISTS:
+            return True
+        if node.type == NodeType.CONDITION_NOT:
+            return self._is_exists_tree(node.operand)
+        if node.type in (NodeType.CONDITION_AND, NodeType.CONDITION_OR):
+            return self._is_exists_tree(node.left) and self._is_exists_tree(node.right)
+        return False
+
+    def _exists_tree(self, node: ASTNode) -> List[Any]:
+        """Build the ExistsTree for a condition, substituting variables in its selectors."""
+        if node.type == NodeType.CONDITION_EXISTS:
+            return ["exists", self.node_selectors(node)[1]]
+        if node.type == NodeType.CONDITION_NOT:
+            return ["not", self._exists_tree(node.operand)]
+        return [self._EXISTS_TREE_OPERATORS[node.type], self._exists_tree(node.left), self._exists_tree(node.right)]
+
     async def execute_if(self, node: ASTNode) -> bool:
         """
         Execute conditional branching logic.
         
         Evaluates a condition and executes appropriate branch (if/else-if/else).
         """
-        # Apply any variable substitution in the condition and evaluate it
-        condition_result = await self.evaluate_condition(node.condition)
+        # The page can't change while the conditions are evaluated, so an exists check
+        # repeated across the if/else-if conditions is only sent to the browser once
+        outer_exists_results = self._exists_results
+        self._exists_results = {}
+        try:
+            branch = await self._choose_branch(node)
+        finally:
+            self._exists_results = outer_exists_results
+
+        if branch is not None and not await self.execute_block(branch):
+            return False
+        return True
 
-        if condition_result:
-            # Execute the if branch
+    async def _choose_branch(self, node: ASTNode) -> Optional[List[ASTNode]]:
+        """Evaluate the conditions of an if statement and return the branch to execute, if any."""
+        # Apply any variable substitution in the condition and evaluate it
+        if await self.evaluate_condition(node.condition):
             self._log("Condition evaluated to true, executing if branch")
-            for statement in node.true_branch:
-                should_continue = await self.execute_node(statement)
-                if not should_continue:
-                    return False
-        elif node.else_if_branches:
-            # Try each else-if branch
-            executed_branch = False
-            
-            for i, (condition, statements) in enumerate(node.else_if_branches):
-                else_if_result = await self.evaluate_condition(condition)
-                if else_if_result:
-                    executed_branch = True
-                    self._log(f"Else-if condition #{i+1} evaluated to true, executing branch")
-                    for statement in statements:
-                        should_continue = await self.execute_node(statement)
-                        if not should_continue:
-                            return False
-                    break
+            return node.true_branch
 
-            # If no else-if branch executed and there's an else branch, execute it
-            if not executed_branch and node.false_branch:
-                self._log("All conditions evaluated to false, executing else branch")
-                for statement in node.false_branch:
-                    should_continue = await self.execute_node(statement)
-                    if not should_continue:
-                        return False
-        elif node.false_branch:
-            # Execute the else branch
-            self._log("Condition evaluated to false, executing else branch")
-            for statement in node.false_branch:
-                should_continue = await self.execute_node(statement)
-                if not should_continue:
-                    return False
+        # Try each else-if branch
+        for i, (condition, statements) in enumerate(node.else_if_branches or ()):
+            if await self.evaluate_condition(condition):
+                self._log("Else-if condition #%d evaluated to true, executing branch", i + 1)
+                return statements
 
-        return True
+        if node.false_branch:
+            if node.else_if_branches:
+                self._log("All conditions evaluated to false, executing else branch")
+            else:
+                self._log("Condition evaluated to false, executing else branch")
+            return node.false_branch
+        return None
 
     async def execute_while(self, node: ASTNode) -> bool:
         """
@@ -738,28 +1026,29 @@ class Interpreter:
         
         Includes safety limit to prevent infinite loops.
         """
-        loop_body: List[ASTNode] = cast(List[ASTNode], node.loop_body)
+        loop_body: List[ASTNode] = node.loop_body
 
         # Save current row state before entering the loop
         self.row_state_stack.append(self.current_row.copy())
-        self._log(f"Saved row state with {len(self.current_row)} fields before entering while loop")
+        self._log("Saved row state with %d fields before entering while loop", len(self.current_row))
 
         try:
-            # Loop as long as the condition is true
+            # Loop as long as the condition is true. The condition is compiled and the
+            # lookups are done once, outside of the loop
+            condition = self.compile_condition(node.condition)
+            execute_block = self.execute_block
             iteration = 0
-            max_iterations = 1000  # Safety limit to prevent infinite loops
+            max_iterations = self.max_while_iterations
 
-            while await self.evaluate_condition(node.condition):
+            while await condition():
                 iteration += 1
                 if iteration > max_iterations:
-                    self._log(f"Loop safety limit reached ({max_iterations} iterations) - terminating while loop")
+                    self._log("Loop safety limit reached (%d iterations) - terminating while loop", max_iterations)
                     break
 
-                self._log(f"While loop iteration {iteration}")
-                for statement in loop_body:
-                    should_continue = await self.execute_node(statement)
-                    if not should_continue:
-                        return False
+                self._log("While loop iteration %d", iteration)
+                if not await execute_block(loop_body):
+                    return False
         finally:
             # Remove the row state for this loop
             if self.row_state_stack:
@@ -775,61 +1064,120 @@ class Interpreter:
         Returns whether execution should continue (False terminates script).
         """
         try:
-            if node.type == NodeType.PROGRAM:
-                return await self.execute_program(node)
-            elif node.type == NodeType.GOTO_URL:
-                return await self.execute_goto_url(node)
-            elif node.type == NodeType.GOTO_HREF:
-                return await self.execute_goto_href(node)
-            elif node.type == NodeType.EXTRACT:
-                return await self.execute_extract(node)
-            elif node.type == NodeType.EXTRACT_LIST:
-                return await self.execute_extract_list(node)
-            elif node.type == NodeType.EXTRACT_ATTRIBUTE:
-                return await self.execute_extract_attribute(node)
-            elif node.type == NodeType.EXTRACT_ATTRIBUTE_LIST:
-                return await self.execute_extract_attribute_list(node)
-            elif node.type == NodeType.SAVE_ROW:
-                return await self.execute_save_row(node)
-            elif node.type == NodeType.CLEAR_ROW:
-                return await self.execute_clear_row(node)
-            elif node.type == NodeType.SET_FIELD:
-                return await self.execute_set_field(node)
-            elif node.type == NodeType.CLICK:
-                return await self.execute_click(node)
-            elif node.type == NodeType.HISTORY_BACK:
-                return await self.execute_history_back(node)
-            elif node.type == NodeType.HISTORY_FORWARD:
-                return await self.execute_history_forward(node)
-            elif node.type == NodeType.LOG:
-                return await self.execute_log(node)
-            elif node.type == NodeType.THROW:
-                return await self.execute_throw(node)
-            elif node.type == NodeType.TIMESTAMP:
-                return await self.execute_timestamp(node)
-            elif node.type == NodeType.EXIT:
-                return await self.execute_exit(node)
-            elif node.type == NodeType.IF:
-                return await self.execute_if(node)
-            elif node.type == NodeType.FOREACH:
-                return await self.execute_foreach(node)
-            elif node.type == NodeType.WHILE:
-                return await self.execute_while(node)
-            elif node.type == NodeType.SELECT:
-                return await self.execute_select(node)
-            elif node.type == NodeType.DATA_SCHEMA:
-                return await self.execute_data_schema(node)
-            elif node.type == NodeType.IS_EMPTY:
-                return await self.evaluate_is_empty(node)
-            else:
-                self._log(f"Unknown node type: {node.type}")
+            handler = self._dispatch.get(node.type)
+            if handler is None:
+                self._log("Unknown node type: %s", node.type)
                 return True
+            return await handler(node)
         except Exception as e:
-            print(f"Error at line {node.line}: {str(e)}")
-            print(f"Node type: {node.type}")
-            traceback.print_exc()
+            self._report_error(node, e)
             raise
 
+    def _report_error(self, node: ASTNode, error: Exception) -> None:
+        """Print the location and traceback of an error raised by a statement."""
+        print(f"Error at line {node.line}: {str(error)}")
+        print(f"Node type: {node.type}")
+        traceback.print_exc()
+
+    async def execute_block(self, statements: List[ASTNode]) -> bool:
+        """
+        Execute a list of statements in order.
+        
+        Runs of independent extract statements are executed concurrently (see
+        batch_parallel), so their browser round-trips overlap. The handler of each
+        statement is looked up once per block and called directly, without going
+        through execute_node.
+        
+        Returns False if execution should terminate early.
+        """
+        plan = self._block_plans.get(id(statements))
+        if plan is None or plan[1] != self.batch_parallel:
+            grouped = self._group_parallelizable(statements) if self.batch_parallel else statements
+            steps = [step if isinstance(step, list) else (step, self._dispatch.get(step.type)) for step in grouped]
+            plan = self._block_plans[id(statements)] = (statements, self.batch_parallel, steps)
+        
+        for step in plan[2]:
+            if isinstance(step, list):
+                should_continue = await self.execute_parallel(step)
+            else:
+                node, handler = step
+                if handler is None:
+                    should_continue = await self.execute_node(node)
+                else:
+                    try:
+                        should_continue = await handler(node)
+                    except Exception as e:
+                        self._report_error(node, e)
+                        raise
+            if not should_continue:
+                return False
+        return True
+
+    def _group_parallelizable(self, statements: List[ASTNode]) -> List[Any]:
+        """
+        Group consecutive independent statements for concurrent execution.
+        
+        Returns the statements in order, with every run of parallel-safe and inline
+        statements writing distinct columns replaced by a list of those statements,
+        if the run holds two or more parallel-safe statements.
+        """
+        steps: List[Any] = []
+        group: List[ASTNode] = []
+        columns: Set[str] = set()
+        
+        def flush() -> None:
+            if sum(statement.type in self.PARALLEL_SAFE_TYPES for statement in group) > 1:
+                steps.append(list(group))
+            else:
+                steps.extend(group)
+            group.clear()
+            columns.clear()
+        
+        for statement in statements:
+            # A substituted column name is only known at run time
+            if (statement.type not in self.PARALLEL_SAFE_TYPES and statement.type not in self.PARALLEL_INLINE_TYPES
+                    or '$' in statement.column_name):
+                flush()
+                steps.append(statement)
+                continue
+            if statement.column_name in columns:
+                flush()
+            group.append(statement)
+            columns.add(statement.column_name)
+        flush()
+        return steps
+
+    async def execute_parallel(self, statements: List[ASTNode]) -> bool:
+        """
+        Execute independent statements concurrently.
+        
+        Columns are added to the current row up front, so the row keeps the same
+        column order as sequential execution. Inline statements run one by one while
+        the others are gathered. Errors are raised in statement order.
+        """
+        for statement in statements:
+            self.current_row.setdefault(statement.column_name, None)
+        
+        inline = [statement.type in self.PARALLEL_INLINE_TYPES for statement in statements]
+        gathered = asyncio.gather(
+            *(self.execute_node(statement) for statement, is_inline in zip(statements, inline) if not is_inline),
+            return_exceptions=True
+        )
+        inline_results = []
+        for statement, is_inline in zip(statements, inline):
+            if is_inline:
+                try:
+                    inline_results.append(await self.execute_node(statement))
+                except Exception as e:
+                    inline_results.append(e)
+        gathered_results = iter(await gathered)
+        inline_results = iter(inline_results)
+        results = [next(inline_results if is_inline else gathered_results) for is_inline in inline]
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return all(results)
+
     async def execute_program(self, program: ASTNode) -> bool:
         """
         Execute the entire program by sequentially executing each statement.
@@ -839,14 +1187,16 @@ class Interpreter:
         if program.type != NodeType.PROGRAM:
             raise ValueError("Expected program node but received different node type")
 
-        for node in program.children:
-            should_continue = await self.execute_node(node)
-            if not should_continue:
-                return False
+        if not await self.execute_block(program.children):
+            return False
 
         return True
 
-    async def execute(self, browser_impl: str = "playwright", headless: bool = False, data_file: str = None) -> List[Dict[str, Any]]:
+    async def execute(self, browser_impl: str = "playwright", headless: bool = False, data_file: str = None,
+                      pool: Optional[BrowserPool] = None,
+                      browser_options: Optional[Dict[str, Any]] = None,
+                      row_sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+                      concurrency: int = 1) -> List[Dict[str, Any]]:
         """
         Main entry point for script execution.
         
@@ -856,15 +1206,32 @@ class Interpreter:
             browser_impl: Browser implementation to use ('playwright' or other supported types)
             headless: Whether to run the browser in headless mode
             data_file: Optional path to a data file (CSV or JSON) for input data
+            pool: Optional browser pool to borrow a launched browser from. When given,
+                  browser_impl and headless are taken from the pool instead
+            browser_options: Optional keyword arguments for the browser implementation,
+                             e.g. {"block_resources": True}
+            row_sink: Optional callable that receives each saved row, replacing the
+                      one given to the constructor (see __init__)
+            concurrency: Number of data rows to process at once (see execute_concurrently).
+                         Only used with a data_file
         
         Returns:
-            List of data rows collected during execution
+            List of data rows collected during execution (empty when a row_sink is set)
         """
+        if row_sink is not None:
+            self.row_sink = row_sink
+        if data_file and concurrency > 1:
+            return await self.execute_concurrently(browser_impl, headless, data_file, concurrency, pool, browser_options)
+        
         try:
             # Initialize browser automation
-            self.browser_automation = BrowserFactory.create(browser_impl)
-            await self.browser_automation.launch(headless=headless)
-            self._log(f"Browser automation launched ({browser_impl}, headless={headless})")
+            if pool:
+                self.browser_automation = await pool.acquire()
+                self._log(f"Browser automation borrowed from pool ({pool.implementation})")
+            else:
+                self.browser_automation = BrowserFactory.create(browser_impl, **(browser_options or {}))
+                await self.browser_automation.launch(headless=headless)
+                self._log(f"Browser automation launched ({browser_impl}, headless={headless})")
 
             # Load data file if provided
             if data_file:
@@ -880,6 +1247,7 @@ class Interpreter:
                     self.current_row = {}
                     self.element_references = {}
                     self.foreach_indexes = {}
+                    self._foreach_elements = {}
                     self.row_state_stack = []
                     
                     # Execute the program for this data row
@@ -888,17 +1256,97 @@ class Interpreter:
                 # No data file - execute the script once
                 await self.execute_program(self.ast)
                 
-            self._log(f"Script execution complete - collected {len(self.rows)} data rows")
+            self._log(f"Script execution complete - collected {self.row_count} data rows")
             return self.rows
         except Exception as e:
             print(f"Script execution failed: {str(e)}")
             traceback.print_exc()
             return self.rows  # Return any collected rows before the error
         finally:
-            if self.browser_automation:
+            if self.browser_automation and pool:
+                await pool.release(self.browser_automation)
+                self._log("Browser returned to pool")
+            elif self.browser_automation:
                 await self.browser_automation.cleanup()
                 self._log("Browser resources cleaned up")
 
+    async def execute_concurrently(self, browser_impl: str, headless: bool, data_file: str, concurrency: int,
+                                   pool: Optional[BrowserPool] = None,
+                                   browser_options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Run the program for every row of a data file, up to `concurrency` rows at once.
+        
+        Data rows share no state apart from the output, so each one runs in a fresh
+        interpreter with the settings of this one, on a browser automation instance
+        borrowed from the pool (a new pool of `concurrency` instances if none is given).
+        Every instance has its own browser context, and so its own cookies and storage,
+        but the Playwright backends run all of them in one shared browser process
+        unless SCRAPESCRIPT_ISOLATED_BROWSER is set. Instances are reset between data rows.
+        
+        Returns:
+            The collected rows, in data file order. A row sink receives the rows as
+            they are saved, so rows of different data rows may interleave there
+        """
+        own_pool = pool is None
+        if own_pool:
+            pool = BrowserPool(browser_impl, size=concurrency, headless=headless, browser_options=browser_options)
+        
+        try:
+            self.data_rows = self.load_data_file(data_file)
+            self._log(f"Loaded {len(self.data_rows)} data rows from {data_file}")
+            
+            # Workers are created when their data row starts, so only running rows hold state
+            workers: List[Optional[Interpreter]] = [None] * len(self.data_rows)
+            slots = asyncio.Semaphore(concurrency)
+            
+            async def run_data_row(row_idx: int) -> None:
+                async with slots:
+                    self._log("Processing data row %d/%d", row_idx + 1, len(self.data_rows))
+                    worker = workers[row_idx] = self._new_worker()
+                    worker.current_data_row = self.data_rows[row_idx]
+                    worker.browser_automation = await pool.acquire()
+                    try:
+                        await worker.execute_program(self.ast)
+                    finally:
+                        await pool.release(worker.browser_automation)
+            
+            results = await asyncio.gather(
+                *(run_data_row(row_idx) for row_idx in range(len(self.data_rows))),
+                return_exceptions=True
+            )
+            
+            # Keep the rows collected before an error, as sequential execution does
+            for row_idx, (worker, result) in enumerate(zip(workers, results)):
+                if isinstance(result, BaseException):
+                    print(f"Script execution failed for data row {row_idx + 1}: {str(result)}")
+                    traceback.print_exception(result)
+                if worker is not None:
+                    self.rows.extend(worker.rows)
+                    self.row_count += worker.row_count
+            
+            self._log(f"Script execution complete - collected {self.row_count} data rows")
+            return self.rows
+        except Exception as e:
+            print(f"Script execution failed: {str(e)}")
+            traceback.print_exc()
+            return self.rows
+        finally:
+            if own_pool:
+                await pool.close()
+
+    def _new_worker(self) -> 'Interpreter':
+        """
+        Create an interpreter for one data row of execute_concurrently, sharing this
+        interpreter's script, output and settings. This interpreter stays the current
+        instance.
+        """
+        current_instance = Interpreter._current_instance
+        worker = type(self)(self.ast, verbose=self.verbose, row_sink=self.row_sink)
+        Interpreter._current_instance = current_instance
+        for name in self.TUNING_ATTRIBUTES:
+            setattr(worker, name, getattr(self, name))
+        return worker
+
     async def execute_data_schema(self, node: ASTNode) -> bool:
         """
         Process a data schema declaration block.
@@ -935,12 +1383,12 @@ class Interpreter:
             
             # Check if empty (None, empty string, etc.)
             is_empty = not resolved_value
-            self._log(f"Is_empty check: '{value}' -> '{resolved_value}' -> {is_empty}")
+            self._log("Is_empty check: '%s' -> '%s' -> %s", value, resolved_value, is_empty)
             return is_empty
             
         # For non-string values
         is_empty = not value
-        self._log(f"Is_empty check: '{value}' -> {is_empty}")
+        self._log("Is_empty check: '%s' -> %s", value, is_empty)
         return is_empty
         
     def resolve_variable(self, var_ref: str) -> Any:
@@ -2,23 +2,54 @@ import asyncio
 import argparse
 import json
 import csv
-from typing import Dict, List, Any
+import sys
+from typing import IO, Callable, Dict, List, Any, Optional
 from lexer import Lexer
 from parser import Parser
 from interpreter import Interpreter
 from browser.factory import BrowserFactory
+from browser.pool import BrowserPool
 
 # Get available browser implementations
-available_browsers = list(BrowserFactory._implementations.keys())
+available_browsers = BrowserFactory.available_implementations()
+
+def configure_event_loop() -> bool:
+    """
+    Use uvloop for the asyncio event loop when it is installed.
+    
+    Browser automation is await-heavy, and uvloop lowers the scheduling overhead of
+    each await. uvloop does not support Windows, where Playwright needs the default
+    ProactorEventLoop, so the default loop is kept there.
+    
+    Returns:
+        True if uvloop was installed as the event loop policy
+    """
+    if sys.platform == "win32":
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
 
 async def run_script(
         script_path: str, 
         browser_impl: str = "playwright", 
         headless: bool = False,
         verbose: bool = False,
-        data_file: str = None
+        data_file: str = None,
+        pool: Optional[BrowserPool] = None,
+        browser_options: Optional[Dict[str, Any]] = None,
+        row_sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+        concurrency: int = 1
         ) -> List[Dict[str, Any]]:
-    """Run a ScrapeScript from a file."""
+    """
+    Run a ScrapeScript from a file, optionally on a browser borrowed from a pool.
+    
+    If row_sink is given, rows are passed to it as they are saved instead of being returned.
+    With a data file, up to `concurrency` data rows are processed at once.
+    """
     # Read the script file
     with open(script_path, 'r') as f:
         script_text: str = f.read()
@@ -36,11 +67,19 @@ async def run_script(
     results = await interpreter.execute(
         browser_impl=browser_impl, 
         headless=headless, 
-        data_file=data_file
+        data_file=data_file,
+        pool=pool,
+        browser_options=browser_options,
+        row_sink=row_sink,
+        concurrency=concurrency
     )
     
     return results
 
+def jsonl_row_sink(f: IO[str]) -> Callable[[Dict[str, Any]], None]:
+    """Return a row sink that writes each saved row to f as one line of JSON."""
+    return lambda row: f.write(json.dumps(row) + '\n')
+
 def save_results(results: List[Dict[str, Any]], output_path: str) -> None:
     """Save the results to a file, handling JSON and CSV formats."""
     if output_path.endswith('.json'):
@@ -63,25 +102,66 @@ def save_results(results: List[Dict[str, Any]], output_path: str) -> None:
 def main() -> None:
     parser = argparse.ArgumentParser(description='ScrapeScript: A DSL for web scraping')
     parser.add_argument('script', help='Path to the ScrapeScript file')
-    parser.add_argument('-o', '--output', help='Output file path (JSON or CSV format)')
+    parser.add_argument('-o', '--output', help='Output file path (JSON, CSV or JSONL format). JSONL rows are written as they are scraped')
     parser.add_argument('-v', '--verbose', action='store_true', help='Print verbose output')
     parser.add_argument('--browser', default='playwright', choices=available_browsers, help='Browser automation implementation to use')
     parser.add_argument('--headless', action='store_true', help='Run the browser in headless mode')
     parser.add_argument('--single-page', action='store_true', help='Use single-page browser automation')
+    parser.add_argument('--block-resources', action='store_true', help='Do not download images, media, fonts and stylesheets')
+    parser.add_argument('--block-resource-types', metavar='TYPES', help='Do not download the given comma-separated Playwright resource types (e.g. image,font)')
+    parser.add_argument('--settle', action='store_true', help='After each navigation, wait for the network to go idle')
+    parser.add_argument('--cache-dir', metavar='DIR', help='Serve pages from a disk cache in DIR, downloading and storing them on a miss')
+    parser.add_argument('--cache-ttl', type=float, default=3600.0, metavar='SECONDS', help='How long cached pages stay valid (default: 3600)')
     parser.add_argument('-d', '--data', help='Path to data file (CSV or JSON) to process with the script')
+    parser.add_argument('-j', '--concurrency', type=int, default=1, help='Number of data file rows to process at once (needs -d). Each row gets its own browser context; by default they all share one browser process')
     
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.concurrency > 1 and not args.data:
+        parser.error('--concurrency needs a data file (-d)')
 
     if (args.single_page and args.browser == 'playwright'):
         args.browser = 'playwright_single_page'
     
+    browser_options: Dict[str, Any] = {}
+    if args.block_resource_types:
+        browser_options['block_resources'] = [t.strip() for t in args.block_resource_types.split(',') if t.strip()]
+    elif args.block_resources:
+        browser_options['block_resources'] = True
+    if args.settle:
+        browser_options['settle_navigation'] = True
+    if args.cache_dir:
+        browser_options['cache_dir'] = args.cache_dir
+        browser_options['cache_ttl'] = args.cache_ttl
+    
     # Run the script
+    configure_event_loop()
+    if args.output and args.output.endswith('.jsonl'):
+        # Stream rows to the file instead of keeping them all in memory. The file is
+        # line buffered, so every saved row is on disk even if the scrape fails later
+        with open(args.output, 'w', buffering=1) as f:
+            asyncio.run(run_script(
+                args.script, 
+                args.browser, 
+                args.headless, 
+                args.verbose,
+                args.data,
+                browser_options=browser_options or None,
+                row_sink=jsonl_row_sink(f),
+                concurrency=args.concurrency
+            ))
+        print(f"Results saved to {args.output}")
+        return
+    
     results: List[Dict[str, Any]] = asyncio.run(run_script(
         args.script, 
         args.browser, 
         args.headless, 
         args.verbose,
-        args.data
+        args.data,
+        browser_options=browser_options or None,
+        concurrency=args.concurrency
     ))
     
     # Print the results to stdout
@@ -49,7 +49,8 @@ class NodeType(Enum):
 # Type alias to facilitate self-referencing ASTNode
 ASTNodeT = TypeVar('ASTNodeT', bound='ASTNode')
 
-@dataclass
+# Slots keep the many nodes of a large script small and their fields fast to read
+@dataclass(slots=True)
 class ASTNode:
     type: NodeType
     line: int
@@ -0,0 +1,267 @@
+import asyncio
+import os
+import re
+import sys
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from browser.interface import BrowserAutomation, Element
+from lexer import Lexer
+from parser import ASTNode, Parser
+
+def parse_script(script: str) -> ASTNode:
+    """Parse ScrapeScript source into its AST."""
+    return Parser(Lexer(script).tokenize()).parse()
+
+# Elements that never have children or an end tag
+VOID_TAGS = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"})
+
+class StubNode:
+    """A parsed HTML element: its tag, attributes and children (nodes and text)."""
+
+    def __init__(self, tag: str, attrs: Dict[str, Optional[str]], parent: Optional['StubNode'] = None) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: List[Any] = []
+
+    def descendants(self) -> List['StubNode']:
+        """All elements below this one, in document order."""
+        found = []
+        for child in self.children:
+            if isinstance(child, StubNode):
+                found.append(child)
+                found.extend(child.descendants())
+        return found
+
+    def text(self) -> str:
+        return "".join(child if isinstance(child, str) else child.text() for child in self.children)
+
+class _TreeBuilder(HTMLParser):
+    """Builds a StubNode tree from HTML."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.root = StubNode("#document", {})
+        self.current = self.root
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        node = StubNode(tag, dict(attrs), self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_endtag(self, tag: str) -> None:
+        node = self.current
+        while node.parent is not None and node.tag != tag:
+            node = node.parent
+        if node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data: str) -> None:
+        self.current.children.append(data)
+
+def parse_html(html: str) -> StubNode:
+    """Parse an HTML string into a StubNode tree rooted at a #document node."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+# One compound selector: optional tag, then any #id, .class and [attr] / [attr=value] parts
+_COMPOUND = re.compile(r"([a-zA-Z][\w-]*|\*)?((?:#[\w-]+|\.[\w-]+|\[[\w-]+(?:=(?:\"[^\"]*\"|'[^']*'|[\w-]+))?\])*)$")
+_PART = re.compile(r"#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=(?:\"([^\"]*)\"|'([^']*)'|([\w-]+)))?\]")
+
+def parse_selector(css: str) -> List[Tuple[str, Any]]:
+    """
+    Parse the CSS subset the stub supports into (combinator, compound) steps.
+
+    Compounds are tag names, #id, .class, [attr] and [attr=value]; they are joined
+    by descendant (space) or child (>) combinators. Anything else raises ValueError,
+    as a browser raises for invalid CSS.
+    """
+    steps: List[Tuple[str, Any]] = []
+    combinator = " "
+    for token in css.replace(">", " > ").split():
+        if token == ">":
+            if not steps or combinator == ">":
+                raise ValueError(f"Invalid selector: {css!r}")
+            combinator = ">"
+            continue
+        match = _COMPOUND.match(token)
+        if match is None or not token:
+            raise ValueError(f"Invalid selector: {css!r}")
+        tag = match.group(1) if match.group(1) not in (None, "*") else None
+        parts = []
+        for part in _PART.finditer(match.group(2)):
+            element_id, class_name, attr = part.group(1), part.group(2), part.group(3)
+            if element_id is not None:
+                parts.append(("id", element_id))
+            elif class_name is not None:
+                parts.append(("class", class_name))
+            else:
+                value = next((v for v in part.group(4, 5, 6) if v is not None), None)
+                parts.append(("attr", (attr, value)))
+        steps.append((combinator, (tag, parts)))
+        combinator = " "
+    if not steps or combinator == ">":
+        raise ValueError(f"Invalid selector: {css!r}")
+    return steps
+
+def _matches_compound(node: StubNode, compound: Any) -> bool:
+    tag, parts = compound
+    if tag is not None and node.tag != tag.lower():
+        return False
+    for kind, value in parts:
+        if kind == "id" and node.attrs.get("id") != value:
+            return False
+        if kind == "class" and value not in (node.attrs.get("class") or "").split():
+            return False
+        if kind == "attr":
+            name, expected = value
+            if name not in node.attrs or (expected is not None and node.attrs[name] != expected):
+                return False
+    return True
+
+def _matches(node: Optional[StubNode], steps: List[Tuple[str, Any]], i: int) -> bool:
+    """Whether node matches steps[:i + 1], checking the combinators right to left."""
+    if node is None or node.tag == "#document" or not _matches_compound(node, steps[i][1]):
+        return False
+    if i == 0:
+        return True
+    if steps[i][0] == ">":
+        return _matches(node.parent, steps, i - 1)
+    ancestor = node.parent
+    while ancestor is not None:
+        if _matches(ancestor, steps, i - 1):
+            return True
+        ancestor = ancestor.parent
+    return False
+
+def select(scope: StubNode, css: str) -> List[StubNode]:
+    """All elements below scope that match a selector, in document order."""
+    steps = parse_selector(css)
+    return [node for node in scope.descendants() if _matches(node, steps, len(steps) - 1)]
+
+class StubElement(Element):
+    """An element of a StubAutomation page."""
+
+    __slots__ = ('node', 'automation')
+
+    def __init__(self, node: StubNode, automation: 'StubAutomation') -> None:
+        self.node = node
+        self.automation = automation
+
+    async def query(self, selector: str) -> Optional[Element]:
+        elements = await self.query_all(selector)
+        return elements[0] if elements else None
+
+    async def query_all(self, selector: str) -> List[Element]:
+        self.automation.calls["query"] += 1
+        return [StubElement(node, self.automation) for node in select(self.node, selector)]
+
+class StubAutomation(BrowserAutomation, name="stub"):
+    """
+    In-memory browser automation for offline tests, serving HTML strings keyed by URL.
+
+    Only the interface methods every backend must implement are provided, so the
+    interpreter runs on the default implementations of BrowserAutomation. Browser
+    calls are counted by name in `calls`.
+
+    Clicking an element with a data-render attribute replaces the current page with
+    the HTML of the URL it names, without navigating.
+    """
+
+    def __init__(self, pages: Optional[Dict[str, str]] = None, delays: Optional[Dict[str, float]] = None,
+                 reset_error: Optional[Exception] = None, reset_delay: float = 0.0) -> None:
+        """
+        Args:
+            pages: HTML of each URL the stub can navigate to
+            delays: Seconds a goto to the given URLs takes, e.g. to finish data rows out of order
+            reset_error: Raised by reset(), to test discarding broken browsers
+            reset_delay: Seconds reset() takes
+        """
+        self.pages: Dict[str, str] = pages or {}
+        self.delays: Dict[str, float] = delays or {}
+        self.reset_error = reset_error
+        self.reset_delay = reset_delay
+        self.calls: Counter = Counter()
+        self.launched = False
+        self.cleaned_up = False
+        self._history: List[Tuple[str, StubNode]] = []
+        self._position = -1
+
+    @property
+    def document(self) -> Optional[StubNode]:
+        return self._history[self._position][1] if self._history else None
+
+    async def launch(self, headless: bool = True) -> None:
+        self.calls["launch"] += 1
+        self.launched = True
+
+    async def goto(self, url: str, wait_for: Optional[str] = None) -> None:
+        self.calls["goto"] += 1
+        if url not in self.pages:
+            raise ValueError(f"No stub page for {url}")
+        await asyncio.sleep(self.delays.get(url, 0))
+        self._history = self._history[:self._position + 1]
+        self._history.append((url, parse_html(self.pages[url])))
+        self._position += 1
+
+    async def get_current_url(self) -> str:
+        return self._history[self._position][0] if self._history else ""
+
+    async def query_selector(self, selector: str) -> Optional[Element]:
+        elements = await self.query_selector_all(selector)
+        return elements[0] if elements else None
+
+    async def query_selector_all(self, selector: str) -> List[Element]:
+        self.calls["query"] += 1
+        if self.document is None:
+            return []
+        return [StubElement(node, self) for node in select(self.document, selector)]
+
+    async def evaluate_exists(self, tree: List[Any]) -> bool:
+        self.calls["evaluate_exists"] += 1
+        return await super().evaluate_exists(tree)
+
+    async def extract_from_elements(self, elements: List[Element], fields: List[Any]) -> List[List[List[Any]]]:
+        self.calls["extract_from_elements"] += 1
+        return await super().extract_from_elements(elements, fields)
+
+    async def extract_text(self, element: Element) -> str:
+        return element.node.text()
+
+    async def extract_attribute(self, element: Element, attribute: str) -> Optional[str]:
+        return element.node.attrs.get(attribute)
+
+    async def click(self, element: Element) -> bool:
+        self.calls["click"] += 1
+        render = element.node.attrs.get("data-render")
+        if render is not None:
+            url = self._history[self._position][0]
+            self._history[self._position] = (url, parse_html(self.pages[render]))
+        return True
+
+    async def go_back(self) -> None:
+        if self._position > 0:
+            self._position -= 1
+
+    async def go_forward(self) -> None:
+        if self._position < len(self._history) - 1:
+            self._position += 1
+
+    async def reset(self) -> None:
+        self.calls["reset"] += 1
+        await asyncio.sleep(self.reset_delay)
+        if self.reset_error is not None:
+            raise self.reset_error
+        self._history = []
+        self._position = -1
+
+    async def cleanup(self) -> None:
+        self.calls["cleanup"] += 1
+        self.cleaned_up = True
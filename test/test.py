@@ -2,12 +2,13 @@ import asyncio
 import json
 import os
 import sys
+import tempfile
 import time
 from pathlib import Path
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from main import run_script
+from main import run_script, configure_event_loop, jsonl_row_sink
 
 class ScriptTester:
     def __init__(self, test_cases_file='test_cases.json'):
@@ -37,6 +38,32 @@ class ScriptTester:
                     
         return errors
     
+    async def run_case(self, test_case):
+        """Run the script of a test case with the options it sets and return the saved rows"""
+        script = test_case['script']
+        options = {
+            'data_file': test_case.get('data'),
+            'concurrency': test_case.get('concurrency', 1),
+        }
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            if test_case.get('cache'):
+                # Fill the disk cache first, so the checked run is served from it
+                options['browser_options'] = {'cache_dir': tmp_dir}
+                await run_script(script, headless=True, **options)
+                if not os.listdir(tmp_dir):
+                    raise AssertionError("No pages were written to the disk cache")
+            
+            if test_case.get('output') == 'jsonl':
+                # Stream the rows to a JSONL file and read them back
+                output_path = os.path.join(tmp_dir, 'results.jsonl')
+                with open(output_path, 'w') as f:
+                    await run_script(script, headless=True, row_sink=jsonl_row_sink(f), **options)
+                with open(output_path, 'r') as f:
+                    return [json.loads(line) for line in f]
+            
+            return await run_script(script, headless=True, **options)
+    
     async def run_tests(self):
         """Run all tests and print results"""
         print(f"Running {len(self.test_cases)} tests...\n")
@@ -50,7 +77,7 @@ class ScriptTester:
                         
             start_time = time.time()
             try:
-                results = await run_script(script, headless=True)
+                results = await self.run_case(test_case)
                 errors = self.compare_results(expected, results)
                 
                 test_duration = time.time() - start_time
@@ -78,6 +105,7 @@ class ScriptTester:
         return self.failed == 0
 
 if __name__ == "__main__":
+    configure_event_loop()
     tester = ScriptTester()
     success = asyncio.run(tester.run_tests())
     sys.exit(0 if success else 1)
\ No newline at end of file
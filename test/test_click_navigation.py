@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from browser.playwright import PlaywrightError, _click_navigates
+
+class StubFrame:
+    pass
+
+class StubRequest:
+    def __init__(self, frame, navigation=True):
+        self.frame = frame
+        self._navigation = navigation
+
+    def is_navigation_request(self):
+        return self._navigation
+
+class StubPage:
+    """Emits the events a click causes and counts round trips into the page."""
+
+    def __init__(self, evaluate_error=None):
+        self.main_frame = StubFrame()
+        self.listeners = {}
+        self.evaluations = 0
+        self.evaluate_error = evaluate_error
+
+    def on(self, event, listener):
+        self.listeners.setdefault(event, []).append(listener)
+
+    def remove_listener(self, event, listener):
+        self.listeners[event].remove(listener)
+
+    def emit(self, event, argument):
+        for listener in list(self.listeners.get(event, [])):
+            listener(argument)
+
+    async def evaluate(self, expression):
+        self.evaluations += 1
+        if self.evaluate_error is not None:
+            raise self.evaluate_error
+
+class StubElement:
+    def __init__(self, on_click=lambda: None):
+        self.on_click = on_click
+
+    async def click(self):
+        self.on_click()
+
+class ClickNavigationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_click_without_navigation(self):
+        page = StubPage()
+        # Requests of other frames are not navigations of the page
+        element = StubElement(lambda: page.emit("request", StubRequest(StubFrame())))
+
+        self.assertFalse(await _click_navigates(page, element))
+        self.assertEqual(page.evaluations, 1)
+        self.assertEqual(page.listeners, {"request": [], "framenavigated": []})
+
+    async def test_navigation_request_during_click(self):
+        page = StubPage()
+        element = StubElement(lambda: page.emit("request", StubRequest(page.main_frame)))
+
+        self.assertTrue(await _click_navigates(page, element))
+        self.assertEqual(page.evaluations, 0)
+
+    async def test_same_document_navigation(self):
+        page = StubPage()
+        element = StubElement(lambda: page.emit("framenavigated", page.main_frame))
+
+        self.assertTrue(await _click_navigates(page, element))
+
+    async def test_document_replaced_after_click(self):
+        page = StubPage(evaluate_error=PlaywrightError("Execution context was destroyed"))
+
+        self.assertTrue(await _click_navigates(page, StubElement()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from browser.pool import BrowserPool
+from interpreter import Interpreter
+from main import jsonl_row_sink
+from stub_browser import parse_script
+
+SCRIPT = """
+data_schema
+  'url' as $url
+end_schema
+
+goto_url '$url'
+extract 'title' 'h1'
+set_field 'url' '$url'
+save_row
+"""
+
+URLS = [f"https://example.test/{i}" for i in range(4)]
+PAGES = {url: f"<html><body><h1>Page {i}</h1></body></html>" for i, url in enumerate(URLS)}
+# The first data rows take longest, so rows finish in reverse order
+DELAYS = {url: 0.04 - 0.01 * i for i, url in enumerate(URLS)}
+
+class ConcurrentDataRowsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        data_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        with data_file:
+            data_file.write("url\n" + "\n".join(URLS) + "\n")
+        self.data_file = data_file.name
+        self.addCleanup(os.unlink, self.data_file)
+
+    async def execute(self, interpreter=None, pages=PAGES, **options):
+        interpreter = interpreter or Interpreter(parse_script(SCRIPT))
+        return await interpreter.execute(browser_impl="stub", data_file=self.data_file,
+                                         browser_options={"pages": pages, "delays": DELAYS}, **options)
+
+    async def test_rows_are_returned_in_data_file_order(self):
+        rows = await self.execute(concurrency=4)
+
+        self.assertEqual(rows, [{"title": f"Page {i}", "url": url} for i, url in enumerate(URLS)])
+
+    async def test_row_sink_receives_rows_as_they_are_saved(self):
+        streamed = []
+        rows = await self.execute(concurrency=4, row_sink=streamed.append)
+
+        self.assertEqual(rows, [])
+        # The slow first rows are still loading when the fast last rows are saved
+        self.assertEqual([row["url"] for row in streamed], URLS[::-1])
+
+    async def test_jsonl_row_sink_writes_one_line_per_row(self):
+        output = io.StringIO()
+        await self.execute(concurrency=2, row_sink=jsonl_row_sink(output))
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(sorted(json.loads(line)["url"] for line in lines), URLS)
+
+    async def test_failing_data_row_does_not_stop_the_others(self):
+        pages = {url: html for url, html in PAGES.items() if url != URLS[1]}
+        with mock.patch("builtins.print"), mock.patch("traceback.print_exception"), mock.patch("traceback.print_exc"):
+            rows = await self.execute(concurrency=4, pages=pages)
+
+        self.assertEqual([row["url"] for row in rows], [URLS[0], URLS[2], URLS[3]])
+
+    async def test_pool_smaller_than_concurrency(self):
+        pool = BrowserPool("stub", size=1, browser_options={"pages": PAGES, "reset_error": RuntimeError("broken")})
+        try:
+            # Used to wait forever for a browser once a reset failed
+            rows = await asyncio.wait_for(self.execute(concurrency=3, pool=pool), timeout=5)
+        finally:
+            await pool.close()
+
+        self.assertEqual(len(rows), len(URLS))
+
+    async def test_workers_inherit_settings_and_current_instance_is_kept(self):
+        interpreter = Interpreter(parse_script(SCRIPT))
+        interpreter.batch_parallel = False
+        interpreter.max_while_iterations = 5
+        workers = []
+        new_worker = Interpreter._new_worker
+
+        def record_worker(self):
+            worker = new_worker(self)
+            workers.append(worker)
+            return worker
+
+        with mock.patch.object(Interpreter, "_new_worker", record_worker):
+            await self.execute(interpreter, concurrency=2)
+
+        self.assertIs(Interpreter.get_current_instance(), interpreter)
+        self.assertEqual(len(workers), len(URLS))
+        for worker in workers:
+            self.assertFalse(worker.batch_parallel)
+            self.assertEqual(worker.max_while_iterations, 5)
+
+if __name__ == "__main__":
+    unittest.main()
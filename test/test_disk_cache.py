@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import browser.playwright as playwright_backend
+
+class StubResponse:
+    def __init__(self, status=200, headers=None, body=b"<html></html>"):
+        self.status = status
+        self.headers = headers or {"content-type": "text/html", "content-encoding": "gzip"}
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+class StubRequest:
+    def __init__(self, url, method="GET", body=None):
+        self.url = url
+        self.method = method
+        self.post_data_buffer = body
+
+class StubRoute:
+    """Records what a route handler did with a request."""
+
+    def __init__(self, request, response):
+        self.request = request
+        self.response = response
+        self.actions = []
+
+    async def fetch(self, max_redirects=None):
+        self.actions.append(("fetch", max_redirects))
+        return self.response
+
+    async def fulfill(self, status, headers, body):
+        self.actions.append(("fulfill", status, headers, body))
+
+    async def fallback(self):
+        self.actions.append(("fallback",))
+
+class StubPage:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+class DiskCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.page = StubPage()
+        await playwright_backend._cache_responses(self.page, self.cache_dir, ttl=60)
+
+    async def request(self, url, response=None, method="GET"):
+        route = StubRoute(StubRequest(url, method), response or StubResponse())
+        await self.page.handler(route)
+        return route.actions
+
+    async def test_replays_stored_responses(self):
+        first = await self.request("https://example.com/")
+        second = await self.request("https://example.com/#top")
+
+        self.assertEqual(first[0], ("fetch", 0))
+        self.assertEqual(second, [("fulfill", 200, {"content-type": "text/html"}, b"<html></html>")])
+
+    async def test_hands_redirects_to_the_browser(self):
+        redirect = StubResponse(302, {"location": "https://example.com/next"}, b"")
+        first = await self.request("https://example.com/old", redirect)
+        second = await self.request("https://example.com/old")
+
+        self.assertEqual(first[-1][:2], ("fulfill", 302))
+        self.assertEqual(second, [("fulfill", 302, {"location": "https://example.com/next"}, b"")])
+
+    async def test_keys_include_the_request_body(self):
+        first = playwright_backend._cache_key(StubRequest("https://example.com/", body=b"a=1"))
+        second = playwright_backend._cache_key(StubRequest("https://example.com/", body=b"a=2"))
+        self.assertNotEqual(first, second)
+
+    async def test_serves_responses_it_cannot_store(self):
+        with mock.patch.object(playwright_backend.os, "replace", side_effect=OSError("disk full")):
+            actions = await self.request("https://example.com/")
+
+        self.assertEqual(actions[-1][:2], ("fulfill", 200))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    async def test_skips_other_methods(self):
+        self.assertEqual(await self.request("https://example.com/", method="POST"), [("fallback",)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,305 @@
+import asyncio
+import os
+import sys
+import unittest
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from interpreter import Interpreter
+from stub_browser import parse_script
+
+URL = "https://example.test/"
+
+LIST_PAGE = """
+<html><body>
+  <h1>Products</h1>
+  <ul class="list">
+    <li class="item" data-id="1"><span class="name">Apple</span><a href="/apple">more</a></li>
+    <li class="item" data-id="2"><span class="name">Banana</span></li>
+    <li class="item"><span class="label">Cherry</span><a href="/cherry">more</a></li>
+  </ul>
+</body></html>
+"""
+
+RENDER_URL = "https://example.test/rendered"
+
+# A list whose buttons replace the page with the list at another URL
+TOGGLE_PAGE = """
+<html><body>
+  <ul class="list">
+    <li class="item"><span class="name">{0}</span><button data-render="{3}">next</button></li>
+    <li class="item"><span class="name">{1}</span><button data-render="{3}">next</button></li>
+    <li class="item"><span class="name">{2}</span><button data-render="{3}">next</button></li>
+  </ul>
+</body></html>
+"""
+
+class InterpreterTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs scripts on the in-memory stub browser."""
+
+    pages = {URL: LIST_PAGE}
+
+    def interpreter(self, body: str, **settings) -> Interpreter:
+        interpreter = Interpreter(parse_script(f"goto_url '{URL}'\n{body}"))
+        for name, value in settings.items():
+            setattr(interpreter, name, value)
+        return interpreter
+
+    async def run_script(self, body: str, **settings):
+        interpreter = self.interpreter(body, **settings)
+        rows = await interpreter.execute(browser_impl="stub", browser_options={"pages": self.pages})
+        return rows, interpreter
+
+class SelectorCacheTest(InterpreterTestCase):
+    async def test_foreach_releases_selectors_of_its_elements(self):
+        rows, interpreter = await self.run_script("""
+foreach '.item' as @item
+  extract 'name' '@item .name'
+  save_row
+end_foreach
+""", prefetch_foreach=False)
+
+        self.assertEqual([row["name"] for row in rows], ["Apple", "Banana", None])
+        self.assertFalse([key for key in interpreter._selector_cache if len(key) == 4 and key[3] is not None])
+
+    async def test_loop_elements_are_resolved_again_after_a_click(self):
+        # Each click swaps the list for the other one, so reads after it must not use the old elements
+        self.pages = {URL: TOGGLE_PAGE.format("Apple", "Banana", "Cherry", RENDER_URL),
+                      RENDER_URL: TOGGLE_PAGE.format("Avocado", "Blueberry", "Coconut", URL)}
+        rows, _ = await self.run_script("""
+foreach '.item' as @item
+  extract 'before' '@item .name'
+  click '@item button'
+  extract 'after' '@item .name'
+  save_row
+end_foreach
+""")
+
+        self.assertEqual(rows, [
+            {"before": "Apple", "after": "Avocado"},
+            {"before": "Blueberry", "after": "Banana"},
+            {"before": "Cherry", "after": "Coconut"},
+        ])
+
+    async def test_inner_foreach_restores_outer_variable_of_the_same_name(self):
+        rows, _ = await self.run_script("""
+foreach '.list' as @node
+  foreach '@node .item' as @node
+    extract 'name' '@node .name', '@node .label'
+    save_row
+  end_foreach
+  extract_attribute 'outer' 'class' '@node'
+  save_row
+end_foreach
+""")
+
+        self.assertEqual([row.get("name") for row in rows[:3]], ["Apple", "Banana", "Cherry"])
+        self.assertEqual(rows[3]["outer"], "list")
+
+class ParallelExtractTest(InterpreterTestCase):
+    def groups(self, body: str):
+        interpreter = self.interpreter(body)
+        steps = interpreter._group_parallelizable(interpreter.ast.children[1:])
+        return [[node.column_name for node in step] if isinstance(step, list) else step.column_name for step in steps]
+
+    async def test_groups_extracts_of_distinct_columns(self):
+        self.assertEqual(self.groups("""
+extract 'title' 'h1'
+extract_list 'names' '.name'
+extract_attribute 'link' 'href' 'a'
+extract 'title' '.label'
+extract 'id' '.item'
+"""), [["title", "names", "link"], ["title", "id"]])
+
+    async def test_substituted_column_names_are_not_grouped(self):
+        self.assertEqual(self.groups("""
+extract 'title' 'h1'
+extract 'name_$row' '.name'
+extract 'label' '.label'
+extract 'link' 'a'
+"""), ["title", "name_$row", ["label", "link"]])
+
+    async def test_other_statements_end_a_group(self):
+        self.assertEqual(self.groups("""
+extract 'title' 'h1'
+set_field 'source' 'stub'
+extract 'name' '.name'
+timestamp 'scraped_at'
+clear_row
+extract 'label' '.label'
+set_field 'kind' 'fruit'
+"""), [["title", "source", "name", "scraped_at"], None, "label", "kind"])
+
+    async def test_inline_statements_are_not_gathered(self):
+        interpreter = self.interpreter("""
+extract 'title' 'h1'
+set_field 'source' 'stub'
+extract 'name' '.name'
+""")
+        statements = interpreter.ast.children[1:]
+        tasks = {}
+
+        async def execute_node(node):
+            tasks[node.column_name] = asyncio.current_task()
+            return True
+
+        interpreter.execute_node = execute_node
+        self.assertTrue(await interpreter.execute_parallel(statements))
+        self.assertIs(tasks["source"], asyncio.current_task())
+        self.assertIsNot(tasks["title"], asyncio.current_task())
+        self.assertIsNot(tasks["name"], asyncio.current_task())
+
+    async def test_columns_keep_statement_order(self):
+        interpreter = self.interpreter("""
+extract 'slow' 'h1'
+extract 'fast' '.name'
+""")
+        statements = interpreter.ast.children[1:]
+
+        async def execute_node(node):
+            await asyncio.sleep(0.02 if node.column_name == "slow" else 0)
+            interpreter.current_row[node.column_name] = node.column_name
+            return True
+
+        interpreter.execute_node = execute_node
+        self.assertTrue(await interpreter.execute_parallel(statements))
+        self.assertEqual(list(interpreter.current_row), ["slow", "fast"])
+
+    async def test_errors_are_raised_in_statement_order(self):
+        interpreter = self.interpreter("""
+extract 'first' 'h1'
+set_field 'inline' 'value'
+extract 'second' '.name'
+""")
+        statements = interpreter.ast.children[1:]
+
+        async def execute_node(node):
+            # The later statements fail first
+            await asyncio.sleep(0.02 if node.column_name == "first" else 0)
+            raise RuntimeError(node.column_name)
+
+        interpreter.execute_node = execute_node
+        with self.assertRaisesRegex(RuntimeError, "first"):
+            await interpreter.execute_parallel(statements)
+
+    async def test_same_rows_as_sequential_execution(self):
+        body = """
+extract 'title' 'h1'
+extract_list 'names' '.name'
+extract_attribute_list 'links' 'href' 'a'
+set_field 'source' 'stub'
+extract 'label' '.label'
+save_row
+"""
+        parallel, _ = await self.run_script(body)
+        sequential, _ = await self.run_script(body, batch_parallel=False)
+
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(list(parallel[0]), ["title", "names", "links", "source", "label"])
+
+class PrefetchForeachTest(InterpreterTestCase):
+    async def assert_same_rows(self, body: str, expected, prefetched: bool = True):
+        """Run a script with and without prefetching and compare the rows with expected."""
+        rows, interpreter = await self.run_script(body)
+        per_element, _ = await self.run_script(body, prefetch_foreach=False)
+
+        self.assertEqual(rows, expected)
+        self.assertEqual(per_element, expected)
+        self.assertEqual(interpreter.browser_automation.calls["extract_from_elements"], 1 if prefetched else 0)
+
+    async def test_fallback_selectors(self):
+        await self.assert_same_rows("""
+foreach '.item' as @item
+  extract 'name' '@item .name', '@item .label'
+  extract_list 'names' '@item .missing', '@item span'
+  save_row
+end_foreach
+""", [
+            {"name": "Apple", "names": ["Apple"]},
+            {"name": "Banana", "names": ["Banana"]},
+            {"name": "Cherry", "names": ["Cherry"]},
+        ])
+
+    async def test_missing_attributes(self):
+        await self.assert_same_rows("""
+foreach '.item' as @item
+  extract_attribute 'id' 'data-id' '@item'
+  extract_attribute 'link' 'href' '@item a'
+  extract_attribute_list 'links' 'href' '@item a'
+  save_row
+end_foreach
+""", [
+            {"id": "1", "link": "/apple", "links": ["/apple"]},
+            {"id": "2", "link": None, "links": []},
+            {"id": None, "link": "/cherry", "links": ["/cherry"]},
+        ])
+
+    async def test_list_of_the_loop_element(self):
+        await self.assert_same_rows("""
+foreach '.item' as @item
+  extract_list 'texts' '@item'
+  save_row
+end_foreach
+""", [{"texts": ["Applemore"]}, {"texts": ["Banana"]}, {"texts": ["Cherrymore"]}])
+
+    async def test_body_with_other_statements_is_read_per_element(self):
+        await self.assert_same_rows("""
+foreach '.item' as @item
+  if exists '@item a'
+    extract 'name' '@item .name', '@item .label'
+  end_if
+  save_row
+end_foreach
+""", [{"name": "Apple"}, {}, {"name": "Cherry"}], prefetched=False)
+
+class ExistsMemoTest(InterpreterTestCase):
+    async def test_else_if_reuses_exists_results_of_its_if(self):
+        rows, interpreter = await self.run_script("""
+if exists '.missing'
+  set_field 'status' 'if'
+else_if exists '.missing'
+  set_field 'status' 'else_if'
+else_if exists 'h1'
+  set_field 'status' 'found'
+end_if
+save_row
+""")
+
+        self.assertEqual(rows, [{"status": "found"}])
+        self.assertEqual(interpreter.browser_automation.calls["evaluate_exists"], 2)
+
+    async def test_results_do_not_outlive_their_if(self):
+        rows, interpreter = await self.run_script("""
+if exists '.missing'
+  set_field 'first' 'found'
+end_if
+click '.item'
+if exists '.missing'
+  set_field 'second' 'found'
+else
+  set_field 'second' 'missing'
+end_if
+save_row
+""")
+
+        self.assertEqual(rows, [{"second": "missing"}])
+        self.assertEqual(interpreter.browser_automation.calls["evaluate_exists"], 2)
+
+    async def test_branch_conditions_are_checked_again(self):
+        # The branch runs after its if's conditions, so a nested if sees the page as it is then
+        rows, interpreter = await self.run_script("""
+if exists '.item'
+  click '.item'
+  if exists '.item'
+    set_field 'nested' 'found'
+  end_if
+end_if
+save_row
+""")
+
+        self.assertEqual(rows, [{"nested": "found"}])
+        self.assertEqual(interpreter.browser_automation.calls["evaluate_exists"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from browser.pool import BrowserPool
+import stub_browser  # Registers the "stub" browser implementation
+
+class BrowserPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def test_reuses_released_browsers(self):
+        async with BrowserPool("stub", size=1) as pool:
+            first = await pool.acquire()
+            await pool.release(first)
+            second = await pool.acquire()
+
+            self.assertIs(first, second)
+            self.assertEqual(first.calls["launch"], 1)
+            self.assertEqual(first.calls["reset"], 1)
+
+    async def test_waiter_gets_replacement_when_reset_fails(self):
+        async with BrowserPool("stub", size=1, browser_options={"reset_error": RuntimeError("reset failed")}) as pool:
+            broken = await pool.acquire()
+            waiter = asyncio.create_task(pool.acquire())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+
+            await pool.release(broken)
+            replacement = await asyncio.wait_for(waiter, timeout=1)
+
+            self.assertIsNot(replacement, broken)
+            self.assertTrue(broken.cleaned_up)
+            self.assertTrue(replacement.launched)
+
+    async def test_waiter_gets_slot_when_launch_fails(self):
+        launch = stub_browser.StubAutomation.launch
+        launches = []
+
+        async def launch_failing_once(automation, headless=True):
+            launches.append(automation)
+            await asyncio.sleep(0)
+            if len(launches) == 1:
+                raise RuntimeError("launch failed")
+            await launch(automation, headless)
+
+        with mock.patch.object(stub_browser.StubAutomation, "launch", launch_failing_once):
+            async with BrowserPool("stub", size=1) as pool:
+                failing = asyncio.create_task(pool.acquire())
+                waiter = asyncio.create_task(pool.acquire())
+                with self.assertRaises(RuntimeError):
+                    await failing
+                automation = await asyncio.wait_for(waiter, timeout=1)
+
+                self.assertIs(automation, launches[1])
+                self.assertTrue(automation.launched)
+
+    async def test_release_during_close(self):
+        pool = BrowserPool("stub", size=1, browser_options={"reset_delay": 0.01})
+        automation = await pool.acquire()
+        releasing = asyncio.create_task(pool.release(automation))
+        await asyncio.sleep(0)
+
+        await pool.close()
+        await asyncio.wait_for(releasing, timeout=1)
+
+        self.assertTrue(automation.cleaned_up)
+        with self.assertRaises(RuntimeError):
+            await pool.acquire()
+
+    async def test_close_wakes_waiters(self):
+        pool = BrowserPool("stub", size=1)
+        automation = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+
+        await pool.close()
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(waiter, timeout=1)
+
+        # Browsers returned after the close are cleaned up, not pooled
+        automation.cleaned_up = False
+        await pool.release(automation)
+        self.assertTrue(automation.cleaned_up)
+
+if __name__ == "__main__":
+    unittest.main()